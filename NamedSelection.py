@@ -2,7 +2,7 @@ bl_info = {
     "name": "Named Selections",
     "description": "Create and manage named selections of objects in the Blender scene.",
     "author": "Kwaku Oteng Aboraa",
-    "version": (1, 0, 1),
+    "version": (2, 0, 0),
     "blender": (2, 93, 0),
     "location": "View3D > Sidebar > Named Selections Panel",
     "warning": "",  # used for warning icon and text in addons panel
@@ -13,28 +13,24 @@ bl_info = {
 # Constants
 GITHUB_USER = "kaboraa"
 GITHUB_REPO = "Blender-Named-Selection-AddOn"
-CURRENT_VERSION = "v1.0.1"  # Update this as needed
+CURRENT_VERSION = "v2.0.0"  # Update this as needed
 
 import os
-import addon_utils
+import re
+import json
+import zlib
+import array
+import base64
+import collections
+import fnmatch
+import functools
 import bpy
 import threading
-import requests
-from bpy.props import StringProperty, CollectionProperty
-from bpy.types import Operator, Panel, PropertyGroup
-
-bpy.types.Scene.show_named_selection_info = bpy.props.BoolProperty(
-    name="Show Info",
-    description="Show additional information about the Named Selection addon",
-    default=False
-)
-
-bpy.types.Scene.show_release_note = bpy.props.BoolProperty(
-    name="Show Release Notes",
-    description="Show release information",
-    default=True
-)
-
+import time
+from bpy.app.handlers import persistent
+from bpy.props import StringProperty, CollectionProperty, IntProperty, PointerProperty, EnumProperty, BoolProperty
+from bpy.types import Operator, Panel, PropertyGroup, UIList
+from bpy_extras.io_utils import ExportHelper, ImportHelper
 
 # Define a simple property to store the update message
 def get_addon_prefs():
@@ -44,61 +40,521 @@ def get_addon_prefs():
 def register_properties():
     """Registers custom properties used by the addon.
 
-    This includes properties for update messages and showing release notes.
+    This includes properties for update messages, showing release notes and the
+    collapsible panel sections, the selection history limits, and the named
+    selections of each scene. Nothing is
+    added to the Blender types before the addon is registered.
     """
+    bpy.types.Scene.named_selections = CollectionProperty(type=NamedSelection)
+    bpy.types.Scene.named_selections_index = bpy.props.IntProperty()
+    bpy.types.Scene.named_selections_next_uid = bpy.props.IntProperty(default=1, options={'HIDDEN'})
+    bpy.types.Scene.show_named_selection_info = bpy.props.BoolProperty(
+        name="Show Info",
+        description="Show additional information about the Named Selection addon",
+        default=False
+    )
+    bpy.types.Scene.show_release_note = bpy.props.BoolProperty(
+        name="Show Release Notes",
+        description="Show release information",
+        default=True
+    )
+    bpy.types.Scene.show_named_selection_rules = bpy.props.BoolProperty(
+        name="Rules",
+        description="Show the rules of the active named selection",
+        default=False
+    )
+    bpy.types.Scene.show_named_selection_stats = bpy.props.BoolProperty(
+        name="Statistics",
+        description="Show timing statistics of the Named Selection addon",
+        default=False
+    )
+    bpy.types.Scene.show_named_selection_history = bpy.props.BoolProperty(
+        name="Selection History",
+        description="Show the recent selections of the viewport",
+        default=False
+    )
+    bpy.types.WindowManager.named_selection_history_size = bpy.props.IntProperty(
+        name="History Size",
+        description="How many recent selections are kept",
+        default=20, min=1, max=1000
+    )
+    bpy.types.WindowManager.named_selection_history_memory = bpy.props.IntProperty(
+        name="History Memory (KiB)",
+        description="How much memory the recent selections may take before the oldest ones are forgotten",
+        default=4096, min=16
+    )
     bpy.types.WindowManager.update_check_message = bpy.props.StringProperty(
         name="Update Check Message",
         default="Current version: " + CURRENT_VERSION
     )
+    bpy.types.WindowManager.named_selection_instrumentation = bpy.props.BoolProperty(
+        name="Record Statistics",
+        description="Record call counts, latencies and members touched of the addon's hot paths",
+        default=False,
+        update=on_instrumentation_toggled
+    )
 
 
 def unregister_properties():
+    del bpy.types.Scene.named_selections
+    del bpy.types.Scene.named_selections_index
+    del bpy.types.Scene.named_selections_next_uid
+    del bpy.types.Scene.show_named_selection_info
+    del bpy.types.Scene.show_release_note
+    del bpy.types.Scene.show_named_selection_rules
+    del bpy.types.Scene.show_named_selection_stats
+    del bpy.types.Scene.show_named_selection_history
+    del bpy.types.WindowManager.named_selection_history_size
+    del bpy.types.WindowManager.named_selection_history_memory
     del bpy.types.WindowManager.update_check_message
- 
+    del bpy.types.WindowManager.named_selection_instrumentation
+    set_instrumentation_enabled(False)
+
+
+class HotPathStats:
+    """Call count, latency histogram and members touched of one instrumented function.
+
+    Latencies are counted in power of two microsecond buckets, so memory stays
+    constant however often the function is called, and percentiles are read from
+    the buckets' upper bounds.
+
+    Attributes:
+        calls (int): The number of recorded calls.
+        total (float): The total time spent in the function, in seconds.
+        max (float): The slowest recorded call, in seconds.
+        members (int): The total number of members touched.
+        buckets (list): Bucket i counts the calls that took less than 2**i microseconds.
+    """
+
+    __slots__ = ("calls", "total", "max", "members", "buckets")
+
+    BUCKET_COUNT = 32
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.members = 0
+        self.buckets = [0] * self.BUCKET_COUNT
+
+    def record(self, seconds, members):
+        self.calls += 1
+        self.total += seconds
+        self.members += members
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), self.BUCKET_COUNT - 1)] += 1
+
+    def percentile(self, fraction):
+        """Return an upper bound for the given percentile of the latencies, in seconds."""
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= threshold:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1000.0,
+            "p50_ms": self.percentile(0.5) * 1000.0,
+            "p95_ms": self.percentile(0.95) * 1000.0,
+            "max_ms": self.max * 1000.0,
+            "members_touched": self.members,
+            "histogram_us": {f"<{1 << bucket}": count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+# Instrumentation is off by default; "touched" counts members touched since startup and
+# "counters" counts background events such as reconciliation passes, both cheap enough to
+# keep counting while instrumentation is disabled
+_instrumentation = {"enabled": False, "stats": {}, "touched": 0, "counters": {}}
+
+
+def set_instrumentation_enabled(enabled):
+    """Turn recording of hot path statistics on or off."""
+    _instrumentation["enabled"] = enabled
+
+
+def on_instrumentation_toggled(self, context):
+    set_instrumentation_enabled(self.named_selection_instrumentation)
+
+
+def note_members_touched(count):
+    """Count members read or written by the instrumented call in progress."""
+    _instrumentation["touched"] += count
+
+
+def count_event(name, amount=1):
+    """Add to one of the event counters reported with the hot path statistics."""
+    counters = _instrumentation["counters"]
+    counters[name] = counters.get(name, 0) + amount
+
+
+def get_hot_path_stats():
+    """Return the recorded statistics by function name."""
+    return _instrumentation["stats"]
+
+
+def get_event_counters():
+    """Return the event counters by name."""
+    return _instrumentation["counters"]
+
+
+def reset_hot_path_stats():
+    _instrumentation["stats"].clear()
+    _instrumentation["counters"].clear()
+
+
+def instrumented(function):
+    """Record the calls of a hot path function while instrumentation is enabled.
+
+    Blender checks the argument count of operator and panel methods, so the wrapper
+    keeps the two positional arguments of the functions it is used on: operator and
+    panel methods taking (self, context) and handlers taking (scene, depsgraph).
+    When instrumentation is disabled, the only overhead is one dictionary lookup.
+    """
+    assert function.__code__.co_argcount == 2, "Only functions with two arguments can be instrumented"
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(first, second=None):
+        if not _instrumentation["enabled"]:
+            return function(first, second)
+
+        touched = _instrumentation["touched"]
+        start = time.perf_counter()
+        try:
+            return function(first, second)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = _instrumentation["stats"].get(name)
+            if stats is None:
+                stats = _instrumentation["stats"][name] = HotPathStats()
+            stats.record(elapsed, _instrumentation["touched"] - touched)
+
+    return wrapper
+
+
+# How long a fetched release stays fresh before the next click asks GitHub again
+UPDATE_CHECK_TTL = 6 * 60 * 60
+
+# Seconds to wait for GitHub before giving up on an update check
+UPDATE_CHECK_TIMEOUT = 5.0
+
+# Seconds between the main thread polls for the result of a running update check
+UPDATE_CHECK_POLL_INTERVAL = 0.2
+
+
+class UpdateChecker:
+    """Looks up the latest release of the addon without blocking the Blender UI.
+
+    The last answer is cached on disk together with its ETag. While the cache is
+    younger than ttl it is answered without a request, afterwards a conditional
+    request is sent so an unchanged release costs a 304 instead of a full
+    response. Concurrent checks share one background request, and the result is
+    handed to the callbacks on the main thread through bpy.app.timers.
+
+    Attributes:
+        url (str): The release endpoint that is queried.
+        cache_path (str): The JSON file that holds the cached answer.
+        ttl (float): Seconds a cached answer is used without a request.
+        timeout (float): Seconds to wait for the server.
+    """
+
+    def __init__(self, url, cache_path, ttl=UPDATE_CHECK_TTL, timeout=UPDATE_CHECK_TIMEOUT):
+        self.url = url
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._thread = None
+        self._callbacks = []
+        self._outcome = None
+        # bpy.app.timers matches callbacks by identity, so the bound method is made once
+        self._deliver_timer = self._deliver
+
+    @property
+    def is_checking(self):
+        with self._lock:
+            return self._thread is not None
+
+    def load_cache(self):
+        """Return the cached answer, or an empty dict if there is none or it is unreadable."""
+        try:
+            with open(self.cache_path) as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def save_cache(self, cache):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(self.cache_path, "w") as cache_file:
+                json.dump(cache, cache_file)
+        except OSError:
+            # A cache that cannot be written only costs a request next time
+            pass
+
+    def fetch(self, cache):
+        """Ask the server for the latest release, revalidating the cached answer.
+
+        Runs on the background thread and touches no Blender data.
+
+        Returns:
+            dict: The new cache entry, holding the latest version, its ETag and the time of the check.
+        """
+        headers = {"Accept": "application/vnd.github+json"}
+        if cache.get("etag") and cache.get("latest_version"):
+            headers["If-None-Match"] = cache["etag"]
+
+        # Imported here so that enabling the addon does not load the network stack
+        import requests
+
+        response = requests.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return dict(cache, checked_at=time.time())
+        response.raise_for_status()
+        return {
+            "latest_version": response.json()["tag_name"],
+            "etag": response.headers.get("ETag"),
+            "checked_at": time.time(),
+        }
+
+    def check(self, callback, force=False):
+        """Look up the latest release and call callback(latest_version, error) on the main thread.
+
+        A fresh cached answer is delivered right away. Otherwise a background request
+        is started, or joined if one is already running.
+
+        Returns:
+            bool: True if the answer arrives later, False if callback was already called.
+        """
+        cache = self.load_cache()
+        age = time.time() - cache.get("checked_at", 0.0)
+        if not force and cache.get("latest_version") and 0.0 <= age < self.ttl:
+            callback(cache["latest_version"], None)
+            return False
+
+        with self._lock:
+            self._callbacks.append(callback)
+            if self._thread is not None:
+                return True
+            self._outcome = None
+            self._thread = threading.Thread(target=self._run, args=(cache,), daemon=True)
+            self._thread.start()
+
+        bpy.app.timers.register(self._deliver_timer, first_interval=UPDATE_CHECK_POLL_INTERVAL)
+        return True
+
+    def _run(self, cache):
+        try:
+            cache = self.fetch(cache)
+            self.save_cache(cache)
+            outcome = (cache["latest_version"], None)
+        except Exception as e:
+            outcome = (None, str(e))
+
+        with self._lock:
+            self._outcome = outcome
+
+    def _deliver(self):
+        # Timer callback on the main thread; keeps polling until the request finished
+        with self._lock:
+            if self._outcome is None:
+                return UPDATE_CHECK_POLL_INTERVAL
+            (latest_version, error), callbacks = self._outcome, self._callbacks
+            self._thread, self._callbacks, self._outcome = None, [], None
+
+        for callback in callbacks:
+            callback(latest_version, error)
+        return None
+
+    def cancel(self):
+        """Stop waiting for a running request; its result is dropped."""
+        if bpy.app.timers.is_registered(self._deliver_timer):
+            bpy.app.timers.unregister(self._deliver_timer)
+        with self._lock:
+            self._thread, self._callbacks, self._outcome = None, [], None
+
+
+_update_checker = {"instance": None}
+
+
+def get_update_checker():
+    """Return the update checker of the addon, created on first use."""
+    if _update_checker["instance"] is None:
+        _update_checker["instance"] = UpdateChecker(
+            url=f"https://api.github.com/repos/{GITHUB_USER}/{GITHUB_REPO}/releases/latest",
+            cache_path=bpy.utils.user_resource('CONFIG', path=os.path.join("named_selection", "update_check.json")),
+        )
+    return _update_checker["instance"]
+
+
+def format_update_message(latest_version, error):
+    if error is not None:
+        return f"Failed to check for updates: {error}"
+    if latest_version is None:
+        return "Could not check for updates. Please try again later."
+    if latest_version == CURRENT_VERSION:
+        return "You are using the latest version."
+    return f"Update available! Latest version: {latest_version}"
+
+
+def show_update_message(latest_version, error):
+    # Called on the main thread, so the window manager can be written safely
+    bpy.context.window_manager.update_check_message = format_update_message(latest_version, error)
+    tag_view3d_redraw(bpy.context)
+
+
 class CheckForUpdateOperator(bpy.types.Operator):
     """Operator to check for updates to the addon from GitHub.
 
     This operator checks the specified GitHub repository for the latest release version
-    and compares it with the current version of the addon.
+    and compares it with the current version of the addon. The check runs in the
+    background and its answer is cached, so repeated clicks do not block Blender
+    or query GitHub again until the cache expires.
     """
     bl_idname = "wm.check_for_update"
     bl_label = "Check for Update"
 
+    @instrumented
     def execute(self, context):
-        # Set the initial message
+        # Set the initial message; a cached answer replaces it right away
         context.window_manager.update_check_message = "Checking for updates..."
-        # Run the version check in a new thread to avoid blocking the Blender UI
-        thread = threading.Thread(target=self.check_for_update, args=(context,))
-        thread.start()
+        get_update_checker().check(show_update_message)
         return {'FINISHED'}
 
-    def check_for_update(self, context):
-        try:
-            latest_version = self.get_latest_release(GITHUB_USER, GITHUB_REPO)
-            current_version = CURRENT_VERSION
-            # Prepare the message
-            if latest_version is None:
-                message = "Could not check for updates. Please try again later."
-            elif latest_version == current_version:
-                message = "You are using the latest version."
-            else:
-                message = f"Update available! Latest version: {latest_version}"
 
-            # Update the message property
-            context.window_manager.update_check_message = message
-            
-        except Exception as e:
-            message = f"Failed to check for updates: {str(e)}"
-            context.window_manager.update_check_message = message
-
-    def get_latest_release(self, user, repo):
-        url = f"https://api.github.com/repos/{user}/{repo}/releases/latest"
-        response = requests.get(url)
-        if response.ok:
-            return response.json()['tag_name']
-        else:
-            return None  
-        
+# The layout of the members of a named selection. Files saved before version 1 stored
+# each member as a property group holding only the object name, named selections saved
+# before version 2 have no uid, and before version 3 object named selections stored a
+# property group per member instead of linking the objects into a storage collection.
+MEMBER_LAYOUT_VERSION = 3
+
+# A scene custom property holding the oldest add-on version that can read the named
+# selections of the scene. Versions before 2.0.0 cannot read the current layout and do
+# not check it; later versions leave scenes marked for a newer version alone.
+LAYOUT_MARKER = "named_selections_required_version"
+LAYOUT_REQUIRED_VERSION = (2, 0, 0)
+
+# Storage collections are named after the uid of their named selection; the leading dot
+# hides them from Blender's collection search menus
+STORAGE_COLLECTION_PREFIX = ".NamedSelection."
+
+# Approximate bytes a member takes in a .blend file and in every undo step that copies it.
+# A property group member is an IDProperty group holding an object pointer IDProperty,
+# each written with its own block header; a collection member is a single CollectionObject
+# link with its block header.
+ITEM_MEMBER_BYTES = 2 * (136 + 24)
+COLLECTION_MEMBER_BYTES = 24 + 24
+
+
+# A custom property group that stores one object of a named selection
+class NamedSelectionMember(PropertyGroup):
+    """
+    Custom property group for storing one object of a named selection.
+
+    The object is referenced directly, so a member survives renames and is resolved
+    without a name lookup. The name of the property group is only used to migrate
+    members saved with the legacy name based layout.
+
+    Members of element named selections also store which vertices, edges or faces of
+    the object's mesh are selected, as a compressed bit mask (see pack_element_mask).
+
+    Attributes:
+        object (PointerProperty): The object referenced by the member.
+        elements (StringProperty): The packed element mask, empty for object named selections.
+        element_count (IntProperty): The number of elements the mask was stored for.
+    """
+
+    object: PointerProperty(type=bpy.types.Object) # The object of the member
+    elements: StringProperty(options={'HIDDEN'}) # The packed mask of the selected elements
+    element_count: IntProperty(options={'HIDDEN'}) # The element count of the mesh when it was stored
+
+
+# What a named selection selects: whole objects, or vertices, edges or faces of meshes
+ELEMENT_TYPES = [
+    ('OBJECT', "Objects", "Select whole objects", 'OBJECT_DATA', 0),
+    ('VERTEX', "Vertices", "Select mesh vertices in edit mode", 'VERTEXSEL', 1),
+    ('EDGE', "Edges", "Select mesh edges in edit mode", 'EDGESEL', 2),
+    ('FACE', "Faces", "Select mesh faces in edit mode", 'FACESEL', 3),
+]
+ELEMENT_TYPE_ICONS = {identifier: icon for identifier, _, _, icon, _ in ELEMENT_TYPES}
+
+# The mesh collection that holds each element type
+ELEMENT_COLLECTIONS = {'VERTEX': "vertices", 'EDGE': "edges", 'FACE': "polygons"}
+
+
+# The kinds of rules a named selection can match objects with
+RULE_TYPES = [
+    ('NAME', "Name", "Object name matches a wildcard pattern, such as 'Tree*'"),
+    ('REGEX', "Name (Regex)", "Object name matches a regular expression"),
+    ('TYPE', "Type", "Object is of the given type"),
+    ('COLLECTION', "Collection", "Object is in the given collection or one of its children"),
+    ('PROPERTY', "Custom Property", "Object has the given custom property, optionally with the given value"),
+    ('MATERIAL', "Material", "Object uses the given material"),
+]
+
+# The object types a rule can match
+OBJECT_TYPES = [
+    ('MESH', "Mesh", ""),
+    ('CURVE', "Curve", ""),
+    ('SURFACE', "Surface", ""),
+    ('META', "Metaball", ""),
+    ('FONT', "Text", ""),
+    ('ARMATURE', "Armature", ""),
+    ('LATTICE', "Lattice", ""),
+    ('EMPTY', "Empty", ""),
+    ('GPENCIL', "Grease Pencil", ""),
+    ('CAMERA', "Camera", ""),
+    ('LIGHT', "Light", ""),
+    ('LIGHT_PROBE', "Light Probe", ""),
+    ('SPEAKER', "Speaker", ""),
+    ('VOLUME', "Volume", ""),
+]
+
+
+# Rules are edited directly in the panel, so every change has to invalidate the cached results
+def on_named_selection_rules_changed(self, context):
+    mark_named_selections_changed()
+
+
+# A custom property group that stores one rule of a dynamic named selection
+class NamedSelectionRule(PropertyGroup):
+    """
+    Custom property group for storing a rule that matches objects by their properties.
+
+    Depending on the rule type, only some of the attributes are used.
+
+    Attributes:
+        rule_type (EnumProperty): What the rule matches on.
+        pattern (StringProperty): The name pattern, regular expression or custom property name.
+        value (StringProperty): The custom property value to match; empty matches any value.
+        object_type (EnumProperty): The object type to match.
+        collection (PointerProperty): The collection whose objects are matched.
+        material (PointerProperty): The material whose users are matched.
+        negate (BoolProperty): Match the objects the rule does not match instead.
+    """
+
+    rule_type: EnumProperty(name="Rule", items=RULE_TYPES, default='NAME', update=on_named_selection_rules_changed)
+    pattern: StringProperty(name="Pattern", update=on_named_selection_rules_changed)
+    value: StringProperty(name="Value", description="Leave empty to match any value", update=on_named_selection_rules_changed)
+    object_type: EnumProperty(name="Type", items=OBJECT_TYPES, default='MESH', update=on_named_selection_rules_changed)
+    collection: PointerProperty(name="Collection", type=bpy.types.Collection, update=on_named_selection_rules_changed)
+    material: PointerProperty(name="Material", type=bpy.types.Material, update=on_named_selection_rules_changed)
+    negate: BoolProperty(name="Exclude", description="Match the objects the rule does not match", update=on_named_selection_rules_changed)
+
+
+# Renaming a named selection from the list bypasses the operators, so it has to be
+# noticed here to keep cached filter results up to date
+def on_named_selection_renamed(self, context):
+    mark_named_selections_changed()
+
+
 # A custom property group that stores the name and objects of a named selection
 class NamedSelection(PropertyGroup):
     """
@@ -108,13 +564,534 @@ class NamedSelection(PropertyGroup):
     and a collection of objects that are part of this selection. It is used
     to manage groups of objects under a user-defined name within the Blender scene.
 
+    Object named selections link their objects into a hidden collection datablock,
+    which costs a single pointer per member and is only written to undo steps when
+    its members change. Element named selections need a mask per member and keep a
+    property group per member in objects. Use get_stored_objects to read either.
+
     Attributes:
         name (StringProperty): The name assigned to the named selection.
-        objects (CollectionProperty): A collection of objects included in the named selection.
+        objects (CollectionProperty): The members of an element named selection, or of one saved before layout version 3.
+        storage (PointerProperty): The collection holding the objects of an object named selection.
+        layout_version (IntProperty): The member layout the named selection is stored in.
+        element_type (EnumProperty): Whether objects or mesh elements are selected.
+        uid (IntProperty): Identifies the named selection within its scene; unlike the name and index it never changes.
+        generator_key (StringProperty): The group a generated named selection was made from, such as "COLLECTION:Trees".
+        use_rules (BoolProperty): Whether the objects matched by the rules are members too.
+        match_all (BoolProperty): Whether an object must match all rules or just one of them.
+        rules (CollectionProperty): The rules of a dynamic named selection.
     """
     
-    name: StringProperty(name="Name", default="Unnamed") # The name of the named selection
-    objects: CollectionProperty(type=bpy.types.PropertyGroup) # The objects in the named selection
+    name: StringProperty(name="Name", default="Unnamed", update=on_named_selection_renamed) # The name of the named selection
+    objects: CollectionProperty(type=NamedSelectionMember) # The members of an element named selection
+    storage: PointerProperty(type=bpy.types.Collection, options={'HIDDEN'}) # The objects of an object named selection
+    layout_version: IntProperty(default=0, options={'HIDDEN'}) # Zero for selections saved by older versions
+    element_type: EnumProperty(name="Elements", items=ELEMENT_TYPES, default='OBJECT') # Fixed when the selection is created
+    uid: IntProperty(default=0, options={'HIDDEN'}) # Zero until assigned by new_named_selection or the migration
+    generator_key: StringProperty(options={'HIDDEN'}) # Empty unless made by generate_named_selections
+    use_rules: BoolProperty(
+        name="Use Rules",
+        description="Also include the objects matched by the rules, evaluated whenever the selection is used",
+        default=False,
+        update=on_named_selection_rules_changed
+    )
+    match_all: BoolProperty(
+        name="Match All",
+        description="Objects must match all rules instead of any of them",
+        default=True,
+        update=on_named_selection_rules_changed
+    )
+    rules: CollectionProperty(type=NamedSelectionRule) # The rules of a dynamic named selection
+
+
+def allocate_named_selection_uid(scene):
+    """Return a named selection uid that was never used in the scene before."""
+    uid = max(scene.named_selections_next_uid, 1)
+    scene.named_selections_next_uid = uid + 1
+    return uid
+
+
+def mark_scene_layout(scene):
+    """Record in a scene that its named selections need this add-on version or newer."""
+    if tuple(scene.get(LAYOUT_MARKER, ())) < LAYOUT_REQUIRED_VERSION:
+        scene[LAYOUT_MARKER] = LAYOUT_REQUIRED_VERSION
+
+
+def is_scene_layout_supported(scene):
+    """Check whether the named selections of a scene were not saved for a newer add-on version."""
+    return tuple(scene.get(LAYOUT_MARKER, ())) <= tuple(bl_info["version"])
+
+
+def new_named_selection(scene, name):
+    """Add an empty named selection to a scene and return it."""
+    mark_scene_layout(scene)
+    invalidate_membership_indices()
+    mark_named_selections_changed()
+    named_selection = scene.named_selections.add()
+    named_selection.name = name
+    named_selection.layout_version = MEMBER_LAYOUT_VERSION
+    named_selection.uid = allocate_named_selection_uid(scene)
+    return named_selection
+
+
+def migrate_named_selections(scene):
+    """Convert named selections saved with object names to object references.
+
+    Members whose object can no longer be found are dropped, named selections
+    without a uid get one, and the members of object named selections are moved
+    into a storage collection. Selections that are already stored in the current
+    layout are left alone.
+
+    Scenes marked for a newer add-on version are left alone.
+
+    Returns:
+        int: The number of named selections that were migrated.
+    """
+    if not is_scene_layout_supported(scene):
+        return 0
+    if len(scene.named_selections):
+        mark_scene_layout(scene)
+
+    migrated = 0
+    objects_by_name = None
+
+    for named_selection in scene.named_selections:
+        if named_selection.layout_version >= MEMBER_LAYOUT_VERSION:
+            continue
+
+        objects = None
+        if named_selection.layout_version < 1:
+            # Resolve all names against a single pass over the objects
+            if objects_by_name is None:
+                objects_by_name = {obj.name: obj for obj in bpy.data.objects}
+            objects = [objects_by_name.get(member.name) for member in named_selection.objects]
+        elif named_selection.element_type == 'OBJECT':
+            objects = [member.object for member in named_selection.objects]
+
+        if not named_selection.uid:
+            named_selection.uid = allocate_named_selection_uid(scene)
+        named_selection.layout_version = MEMBER_LAYOUT_VERSION
+
+        # The members are added again in the current layout
+        if objects is not None:
+            named_selection.objects.clear()
+            _membership_indices.pop(named_selection.as_pointer(), None)
+            add_members(named_selection, [obj for obj in objects if obj is not None])
+        migrated += 1
+
+    if migrated:
+        invalidate_reverse_indices()
+    return migrated
+
+
+# Incremented whenever named selections or their members change, so that cached views
+# of them (such as the panel state) can tell they are stale without looking inside.
+# The scene revision counts changes to the objects that rules match on.
+_revision = {"value": 0, "scene": 0}
+
+
+def mark_named_selections_changed():
+    """Invalidate everything that caches the contents of named selections."""
+    _revision["value"] += 1
+
+
+def mark_scene_content_changed():
+    """Invalidate everything that caches the results of named selection rules."""
+    _revision["scene"] += 1
+
+
+def get_revision():
+    """Return a key that changes whenever the resolved members of any named selection may change."""
+    return _revision["value"], _revision["scene"]
+
+
+class MembershipIndex:
+    """Hashed lookup from member object to its slot in a named selection's members.
+
+    The index is kept in sync by add_members, remove_members and clear_members, so
+    adding, removing and testing a member each take constant time. It is rebuilt
+    lazily whenever it no longer matches the members, e.g. after undo or file load.
+    Slots are only kept exact for property group members, which are removed by slot.
+
+    Attributes:
+        slots (dict): Maps each member object to its index in the members.
+        length (int): The number of members the index describes.
+    """
+
+    __slots__ = ("slots", "length")
+
+    def __init__(self, objects):
+        self.slots = {obj: slot for slot, obj in enumerate(objects)}
+        self.length = len(objects)
+
+
+# Membership indices by the address of their named selection. Addresses are only stable
+# until the scene's named_selections are reallocated, so the cache is dropped whenever a
+# selection is added or removed and after file load, undo and redo.
+_membership_indices = {}
+
+
+def invalidate_membership_indices():
+    """Drop all cached membership indices; they are rebuilt on next use."""
+    _membership_indices.clear()
+
+
+def uses_compact_storage(named_selection):
+    """Check whether the members of a named selection live in a storage collection."""
+    return named_selection.element_type == 'OBJECT' and named_selection.layout_version >= 3
+
+
+def get_stored_objects(named_selection):
+    """Return the member objects of a named selection in member order, without rule matches.
+
+    Property group members of objects that were deleted are returned as None.
+    """
+    if uses_compact_storage(named_selection):
+        storage = named_selection.storage
+        return storage.objects if storage is not None else ()
+    return [member.object for member in named_selection.objects]
+
+
+def get_stored_count(named_selection):
+    """Return the number of members of a named selection, without rule matches."""
+    if uses_compact_storage(named_selection):
+        storage = named_selection.storage
+        return len(storage.objects) if storage is not None else 0
+    return len(named_selection.objects)
+
+
+def get_storage_collection(named_selection):
+    """Return the storage collection of an object named selection, ready to be changed.
+
+    The collection is created if needed. Copying a scene copies the pointer to it, so
+    a collection that is shared with another scene's selection is copied first and
+    changes to one scene's selection never show up in the other.
+    """
+    storage = named_selection.storage
+    if storage is None:
+        storage = bpy.data.collections.new(f"{STORAGE_COLLECTION_PREFIX}{named_selection.uid}")
+        named_selection.storage = storage
+    elif storage.users > 1:
+        storage = storage.copy()
+        named_selection.storage = storage
+    return storage
+
+
+def release_storage_collection(named_selection):
+    """Drop the storage collection of a named selection, if it has one.
+
+    The collection is only deleted when no other scene's selection still uses it.
+    """
+    storage = named_selection.storage
+    if storage is not None:
+        shared = storage.users > 1
+        named_selection.storage = None
+        if not shared:
+            bpy.data.collections.remove(storage)
+
+
+def get_storage_report(scene):
+    """Estimate how much memory the members of the named selections of a scene take.
+
+    Returns:
+        dict: The number of members and the estimated bytes they take with property
+            group members, with storage collections and in their current layout.
+    """
+    members = item_bytes = compact_bytes = current_bytes = 0
+    for named_selection in scene.named_selections:
+        count = get_stored_count(named_selection)
+        masks = sum(len(member.elements) for member in named_selection.objects)
+        members += count
+        item_bytes += count * ITEM_MEMBER_BYTES + masks
+        if named_selection.element_type == 'OBJECT':
+            compact_bytes += count * COLLECTION_MEMBER_BYTES
+        else:
+            # Element masks stay in property groups
+            compact_bytes += count * ITEM_MEMBER_BYTES + masks
+        if uses_compact_storage(named_selection):
+            current_bytes += count * COLLECTION_MEMBER_BYTES
+        else:
+            current_bytes += count * ITEM_MEMBER_BYTES + masks
+    return {"members": members, "item_bytes": item_bytes, "compact_bytes": compact_bytes, "current_bytes": current_bytes}
+
+
+def get_membership_index(named_selection):
+    """Return the up to date membership index of a named selection."""
+    key = named_selection.as_pointer()
+    index = _membership_indices.get(key)
+    if index is None or index.length != get_stored_count(named_selection):
+        index = _membership_indices[key] = MembershipIndex(get_stored_objects(named_selection))
+    return index
+
+
+def contains_member(named_selection, obj):
+    """Check whether an object is a member of a named selection."""
+    return obj in get_membership_index(named_selection).slots
+
+
+def get_member(named_selection, obj):
+    """Return the member of a named selection that references an object, or None.
+
+    Objects in a storage collection have no member property group, so None is
+    returned for them too.
+    """
+    if uses_compact_storage(named_selection):
+        return None
+    slot = get_membership_index(named_selection).slots.get(obj)
+    return named_selection.objects[slot] if slot is not None else None
+
+
+def add_members(named_selection, objects):
+    """Add objects to a named selection, skipping the ones that are already members.
+
+    Returns:
+        int: The number of objects that were added.
+    """
+    index = get_membership_index(named_selection)
+    slots = index.slots
+    checked = 0
+    added = []
+
+    if uses_compact_storage(named_selection):
+        add_member = get_storage_collection(named_selection).objects.link
+    else:
+        new_member = named_selection.objects.add
+
+        def add_member(obj):
+            new_member().object = obj
+
+    for obj in objects:
+        checked += 1
+        if obj in slots:
+            continue
+        add_member(obj)
+        slots[obj] = index.length
+        index.length += 1
+        added.append(obj)
+
+    note_members_touched(checked)
+    if added:
+        update_reverse_index(named_selection, added=added)
+        mark_named_selections_changed()
+    return len(added)
+
+
+def remove_members(named_selection, objects):
+    """Remove objects from a named selection, ignoring the ones that are not members.
+
+    Returns:
+        int: The number of members that were removed.
+    """
+    index = get_membership_index(named_selection)
+    slots = index.slots
+
+    if uses_compact_storage(named_selection):
+        doomed = list(dict.fromkeys(obj for obj in objects if obj in slots))
+        if doomed:
+            note_members_touched(len(doomed))
+            update_reverse_index(named_selection, removed=doomed)
+            mark_named_selections_changed()
+            unlink = get_storage_collection(named_selection).objects.unlink
+            for obj in doomed:
+                unlink(obj)
+                del slots[obj]
+            index.length -= len(doomed)
+        return len(doomed)
+
+    doomed = {slots[obj] for obj in objects if obj in slots}
+    remove_member_slots(named_selection, sorted(doomed, reverse=True))
+    return len(doomed)
+
+
+def remove_member_slots(named_selection, doomed_slots):
+    """Remove property group members by slot in a single batch.
+
+    Each removed slot is filled with the current last member, so no removal has to
+    shift the rest of the collection. The slots must be given in descending order.
+    Members in a storage collection are removed with remove_members instead.
+    """
+    doomed_slots = list(doomed_slots)
+    if not doomed_slots:
+        return
+
+    index = get_membership_index(named_selection)
+    members = named_selection.objects
+    slots = index.slots
+    note_members_touched(len(doomed_slots))
+    update_reverse_index(named_selection, removed=[members[slot].object for slot in doomed_slots])
+    mark_named_selections_changed()
+
+    for slot in doomed_slots:
+        last = index.length - 1
+        removed_object = members[slot].object
+        if slots.get(removed_object) == slot:
+            del slots[removed_object]
+        if slot != last:
+            moved, target = members[last], members[slot]
+            moved_object = moved.object
+            target.object = moved_object
+            target.elements = moved.elements
+            target.element_count = moved.element_count
+            if slots.get(moved_object) == last:
+                slots[moved_object] = slot
+        members.remove(last)
+        index.length = last
+
+
+def clear_members(named_selection):
+    """Remove all members of a named selection."""
+    objects = list(get_stored_objects(named_selection))
+    note_members_touched(len(objects))
+    update_reverse_index(named_selection, removed=objects)
+    # Dropping the whole storage collection is cheaper than unlinking every object
+    release_storage_collection(named_selection)
+    named_selection.objects.clear()
+    _membership_indices[named_selection.as_pointer()] = MembershipIndex(())
+    mark_named_selections_changed()
+
+
+class ReverseIndex:
+    """Maps each object to the named selections of a scene that contain it.
+
+    The index is built from the members in one pass the first time it is needed and
+    then kept in sync by the functions that add and remove members, so looking up the
+    named selections of an object never scans them. Named selections are identified
+    by uid, which survives renames and removals of other named selections. Objects
+    matched by rules are not indexed, see get_containing_selections.
+
+    Attributes:
+        containers (dict): Maps each member object to the set of uids of the named selections containing it.
+    """
+
+    __slots__ = ("containers",)
+
+    def __init__(self, scene):
+        containers = {}
+        for named_selection in scene.named_selections:
+            uid = named_selection.uid
+            if not uid:
+                continue
+            for obj in get_stored_objects(named_selection):
+                if obj is not None:
+                    containers.setdefault(obj, set()).add(uid)
+        self.containers = containers
+
+    def add(self, uid, objects):
+        containers = self.containers
+        for obj in objects:
+            containers.setdefault(obj, set()).add(uid)
+
+    def discard(self, uid, objects):
+        containers = self.containers
+        for obj in objects:
+            uids = containers.get(obj)
+            if uids is not None:
+                uids.discard(uid)
+                if not uids:
+                    del containers[obj]
+
+    def get(self, obj):
+        return self.containers.get(obj, ())
+
+
+# The reverse index of each scene, by scene address
+_reverse_indices = {}
+
+
+def invalidate_reverse_indices():
+    """Forget all reverse indices; they are rebuilt on first use."""
+    _reverse_indices.clear()
+
+
+def get_reverse_index(scene):
+    """Return the reverse index of a scene, building it if needed."""
+    key = scene.as_pointer()
+    index = _reverse_indices.get(key)
+    if index is None:
+        index = _reverse_indices[key] = ReverseIndex(scene)
+    return index
+
+
+def update_reverse_index(named_selection, added=(), removed=()):
+    """Record added and removed members of a named selection in its scene's reverse index, if built."""
+    key = named_selection.id_data.as_pointer()
+    index = _reverse_indices.get(key)
+    if index is None:
+        return
+    if not named_selection.uid:
+        # Not migrated yet, so it cannot be told apart from other such named selections
+        del _reverse_indices[key]
+        return
+    index.add(named_selection.uid, added)
+    index.discard(named_selection.uid, removed)
+
+
+def get_containing_selections(scene, obj):
+    """Return the named selections of a scene that contain an object, in list order.
+
+    Static members are looked up in the reverse index. Only dynamic named selections
+    are checked one by one, against their cached bitsets.
+    """
+    uids = get_reverse_index(scene).get(obj)
+    bit = None
+    containing = []
+    for named_selection in scene.named_selections:
+        if named_selection.uid in uids:
+            containing.append(named_selection)
+        elif not named_selection.uid and contains_member(named_selection, obj):
+            containing.append(named_selection)
+        elif named_selection.use_rules:
+            if bit is None:
+                bit = get_object_indexer().index_of(obj)
+            if get_selection_bitset(named_selection) >> bit & 1:
+                containing.append(named_selection)
+    return containing
+
+
+def tag_view3d_redraw(context):
+    """Redraw the 3D viewports of the current screen, if there is one (not in background mode)."""
+    if context.screen is None:
+        return
+    for area in context.screen.areas:
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
+
+class UniqueNameAllocator:
+    """Hands out unique named selection names without rescanning the names in use.
+
+    The next free suffix of each base name is remembered, so allocating many names
+    with the same base costs constant time per name instead of a scan from ".01".
+    Taken names get a two digit suffix, such as "Trees.01".
+
+    Attributes:
+        names (set): The names in use, including the ones allocated so far.
+        next_suffix (dict): Maps each base name to the first suffix that may be free.
+    """
+
+    __slots__ = ("names", "next_suffix")
+
+    def __init__(self, names=()):
+        self.names = set(names)
+        self.next_suffix = {}
+
+    def allocate(self, base_name):
+        """Return an unused name based on base_name and mark it as used."""
+        name = base_name
+        if name in self.names:
+            suffix = self.next_suffix.get(base_name, 1)
+            while f"{base_name}.{str(suffix).zfill(2)}" in self.names:
+                suffix += 1
+            self.next_suffix[base_name] = suffix + 1
+            name = f"{base_name}.{str(suffix).zfill(2)}"
+        self.names.add(name)
+        return name
+
+
+def generate_unique_name(scene, base_name="Unnamed"):
+    """Return a named selection name based on base_name that is not used in the scene yet."""
+    return UniqueNameAllocator(ns.name for ns in scene.named_selections).allocate(base_name)
+
 
 # A custom operator that adds a new named selection from the selected objects
 class AddNamedSelection(Operator):
@@ -130,19 +1107,34 @@ class AddNamedSelection(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     name: StringProperty(name="Name", default="Unnamed") # The name of the new named selection
+    # Promotes a snapshot of the selection history instead of using the current selection
+    snapshot: IntProperty(name="Snapshot", default=-1, options={'HIDDEN', 'SKIP_SAVE'})
 
+    @instrumented
     def execute(self, context):
         # Get the scene
         scene = context.scene
+
+        snapshot_objects = None
+        if self.snapshot >= 0:
+            snapshot_objects = get_snapshot_objects(context.view_layer, self.snapshot)
+            if snapshot_objects is None:
+                self.report({'WARNING'}, "No such selection in the history")
+                return {'CANCELLED'}
         
         # Create a new named selection and add it to the scene's custom property
-        named_selection = scene.named_selections.add()
-        named_selection.name = self.name
-
-        # Add the selected objects to the named selection's custom property
-        # This will add objects if there are any selected, otherwise the named selection will be empty
-        for obj in context.selected_objects:
-            named_selection.objects.add().name = obj.name
+        named_selection = new_named_selection(scene, self.name)
+
+        if snapshot_objects is not None:
+            add_members(named_selection, snapshot_objects)
+        # In mesh edit mode, the selected vertices, edges or faces are stored instead of objects
+        elif context.mode == 'EDIT_MESH':
+            named_selection.element_type = get_element_type(context.tool_settings.mesh_select_mode)
+            store_element_selection(named_selection, context.objects_in_mode)
+        else:
+            # Add the selected objects to the named selection's custom property
+            # This will add objects if there are any selected, otherwise the named selection will be empty
+            add_members(named_selection, context.selected_objects)
 
         # Update the listbox index to show the new named selection
         bpy.types.UIList.active_index = len(scene.named_selections) - 1
@@ -152,234 +1144,2092 @@ class AddNamedSelection(Operator):
         scene.named_selections_index = len(scene.named_selections) - 1
         
         # Force a UI refresh
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
+        tag_view3d_redraw(context)
+
+        return {'FINISHED'}
+    
+    def generate_unique_name(self, scene):
+        return generate_unique_name(scene)
+
+    def invoke(self, context, event):
+        # Show a dialog to enter the name of the new named selection
+        scene = context.scene
+        self.name = self.generate_unique_name(scene)
+        return context.window_manager.invoke_props_dialog(self)
+
+# The ways a named selection can be combined with the current selection
+SELECTION_MODES = [
+    ('REPLACE', "Replace", "Select only the objects in the named selection"),
+    ('APPEND', "Append", "Add the objects in the named selection to the current selection"),
+    ('SUBTRACT', "Subtract", "Deselect the objects in the named selection"),
+    ('INTERSECT', "Intersect", "Keep only the selected objects that are also in the named selection"),
+]
+
+
+def get_property_text(value):
+    """Return the text a custom property value is matched and grouped by, or None.
+
+    Arrays and groups are converted to plain lists and dicts first, since their own
+    text is the same for all arrays of a length or contains a memory address. Other
+    values, such as data-blocks, have no text.
+    """
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    if hasattr(value, "to_dict"):
+        return str(value.to_dict())
+    if hasattr(value, "to_list"):
+        return str(value.to_list())
+    return None
+
+
+def compile_rule(rule):
+    """Turn a rule into a predicate taking an object, or None if the rule cannot match anything."""
+    rule_type = rule.rule_type
+
+    if rule_type == 'NAME':
+        match = re.compile(fnmatch.translate(rule.pattern)).match
+        return lambda obj: match(obj.name) is not None
+
+    if rule_type == 'REGEX':
+        try:
+            search = re.compile(rule.pattern).search
+        except re.error:
+            return None
+        return lambda obj: search(obj.name) is not None
+
+    if rule_type == 'TYPE':
+        object_type = rule.object_type
+        return lambda obj: obj.type == object_type
+
+    if rule_type == 'COLLECTION':
+        if rule.collection is None:
+            return None
+        members = set(rule.collection.all_objects)
+        return members.__contains__
+
+    if rule_type == 'PROPERTY':
+        name, value = rule.pattern, rule.value
+        if not name:
+            return None
+        if not value:
+            return lambda obj: obj.get(name) is not None
+        return lambda obj: get_property_text(obj.get(name)) == value
+
+    if rule_type == 'MATERIAL':
+        material = rule.material
+        if material is None:
+            return None
+        return lambda obj: any(slot.material == material for slot in obj.material_slots)
+
+    return None
+
+
+def evaluate_rules(named_selection, objects):
+    """Return the objects matched by the rules of a named selection, in the given order."""
+    predicates = []
+    for rule in named_selection.rules:
+        predicate = compile_rule(rule)
+        if predicate is None:
+            # A rule that matches nothing, unless it is negated
+            predicate = lambda obj: False
+        if rule.negate:
+            predicate = (lambda test: lambda obj: not test(obj))(predicate)
+        predicates.append(predicate)
+
+    if not predicates:
+        return []
+
+    # All rules are checked in the same single pass over the objects
+    combine = all if named_selection.match_all else any
+    matched = [obj for obj in objects if combine(predicate(obj) for predicate in predicates)]
+    note_members_touched(len(objects))
+    return matched
+
+
+# The rule results of each named selection, by address, with the revision they were evaluated at
+_rule_results = {}
+
+
+def get_rule_objects(named_selection):
+    """Return the objects matched by the rules of a named selection.
+
+    Rules are evaluated against the objects of the scene that owns the named selection
+    the first time they are needed, and the result is reused until the rules change or
+    the depsgraph reports a change the rules could depend on.
+    """
+    key = named_selection.as_pointer()
+    cached = _rule_results.get(key)
+    if cached is not None and cached[0] == get_revision():
+        return cached[1]
+
+    objects = evaluate_rules(named_selection, named_selection.id_data.objects)
+    _rule_results[key] = (get_revision(), objects)
+    return objects
+
+
+def get_member_objects(named_selection):
+    """Return the objects of a named selection, in member order.
+
+    For a dynamic named selection, the objects matched by its rules follow the static members.
+    """
+    objects = [obj for obj in get_stored_objects(named_selection) if obj is not None]
+    note_members_touched(len(objects))
+
+    if named_selection.use_rules:
+        static = set(objects)
+        objects.extend(obj for obj in get_rule_objects(named_selection) if obj not in static)
+
+    return objects
+
+
+def get_member_count(named_selection):
+    """Return the number of objects in a named selection, including the ones matched by rules."""
+    if named_selection.use_rules:
+        return len(get_member_objects(named_selection))
+    return get_stored_count(named_selection)
+
+
+def apply_selection(view_layer, objects, mode='REPLACE'):
+    """Combine a set of objects with the current selection of a view layer.
+
+    The new selection is computed as a difference against the current one, and only
+    the objects whose selection state actually changes are written. Objects that are
+    not in the view layer are skipped.
+
+    Args:
+        view_layer (ViewLayer): The view layer whose selection is changed.
+        objects (iterable): The objects to combine with the selection.
+        mode (str): One of the identifiers in SELECTION_MODES.
+
+    Returns:
+        tuple: The number of objects that were selected and deselected.
+    """
+    current = set(view_layer.objects.selected)
+    target = set(objects)
+
+    if mode == 'REPLACE':
+        to_select, to_deselect = target - current, current - target
+    elif mode == 'APPEND':
+        to_select, to_deselect = target - current, ()
+    elif mode == 'SUBTRACT':
+        to_select, to_deselect = (), current & target
+    elif mode == 'INTERSECT':
+        to_select, to_deselect = (), current - target
+    else:
+        raise ValueError(f"Unknown selection mode: {mode}")
+
+    # Blender has no batched access to the selection state of objects, so the
+    # objects that change are flipped one by one
+    selected = 0
+    for obj in to_select:
+        try:
+            obj.select_set(True, view_layer=view_layer)
+        except RuntimeError:
+            # The object is not in this view layer, e.g. it lives in another scene
+            continue
+        selected += 1
+
+    for obj in to_deselect:
+        obj.select_set(False, view_layer=view_layer)
+
+    note_members_touched(len(to_select) + len(to_deselect))
+    return selected, len(to_deselect)
+
+
+def get_element_type(mesh_select_mode):
+    """Return the element type of the first enabled mesh select mode."""
+    return ('VERTEX', 'EDGE', 'FACE')[list(mesh_select_mode).index(True)]
+
+
+def pack_element_mask(mask):
+    """Pack a boolean NumPy array into a compact ASCII string for a StringProperty."""
+    import numpy as np
+    return base64.b64encode(zlib.compress(np.packbits(mask).tobytes(), 1)).decode("ascii")
+
+
+def unpack_element_mask(data, count):
+    """Unpack a string made by pack_element_mask into a boolean NumPy array of count elements."""
+    import numpy as np
+    bits = np.frombuffer(zlib.decompress(base64.b64decode(data)), dtype=np.uint8)
+    return np.unpackbits(bits, count=count).astype(bool)
+
+
+def combine_element_masks(current, operand, mode):
+    """Combine two element masks the way apply_selection combines object sets."""
+    if mode == 'REPLACE':
+        return operand
+    if mode == 'APPEND':
+        return current | operand
+    if mode == 'SUBTRACT':
+        return current & ~operand
+    if mode == 'INTERSECT':
+        return current & operand
+    raise ValueError(f"Unknown selection mode: {mode}")
+
+
+def read_mesh_array(elements, attribute, dtype, components=1):
+    import numpy as np
+    array = np.empty(len(elements) * components, dtype=dtype)
+    elements.foreach_get(attribute, array)
+    return array
+
+
+def read_element_mask(mesh, element_type):
+    """Return the selection state of the vertices, edges or faces of a mesh as a boolean array."""
+    import numpy as np
+    return read_mesh_array(getattr(mesh, ELEMENT_COLLECTIONS[element_type]), "select", np.bool_)
+
+
+def write_element_selection(mesh, element_type, mask):
+    """Select the elements of a mesh given by a mask, keeping the other element types consistent.
+
+    Blender expects the vertex, edge and face selection of a mesh to agree, so the flags
+    of the other two element types are derived from the mask, the way edit mode flushes
+    a selection. Everything is computed on whole arrays and written with foreach_set.
+    """
+    import numpy as np
+    vertex_count, edge_count = len(mesh.vertices), len(mesh.edges)
+    edge_vertices = read_mesh_array(mesh.edges, "vertices", np.int32, 2).reshape(-1, 2)
+    loop_starts = read_mesh_array(mesh.polygons, "loop_start", np.int32)
+
+    if element_type == 'VERTEX':
+        vertices = mask
+        edges = vertices[edge_vertices].all(axis=1)
+        # A face is selected when all of its vertices are
+        loop_vertices = read_mesh_array(mesh.loops, "vertex_index", np.int32)
+        faces = np.logical_and.reduceat(vertices[loop_vertices], loop_starts) if len(loop_starts) else loop_starts.astype(bool)
+    elif element_type == 'EDGE':
+        edges = mask
+        vertices = np.zeros(vertex_count, dtype=bool)
+        vertices[edge_vertices[edges].ravel()] = True
+        # A face is selected when all of its edges are
+        loop_edges = read_mesh_array(mesh.loops, "edge_index", np.int32)
+        faces = np.logical_and.reduceat(edges[loop_edges], loop_starts) if len(loop_starts) else loop_starts.astype(bool)
+    else:
+        faces = mask
+        # The vertices and edges of the selected faces are selected
+        loop_selected = np.repeat(faces, read_mesh_array(mesh.polygons, "loop_total", np.int32))
+        vertices = np.zeros(vertex_count, dtype=bool)
+        vertices[read_mesh_array(mesh.loops, "vertex_index", np.int32)[loop_selected]] = True
+        edges = np.zeros(edge_count, dtype=bool)
+        edges[read_mesh_array(mesh.loops, "edge_index", np.int32)[loop_selected]] = True
+
+    mesh.vertices.foreach_set("select", vertices)
+    mesh.edges.foreach_set("select", edges)
+    mesh.polygons.foreach_set("select", faces)
+
+
+def store_element_selection(named_selection, objects, mode='REPLACE'):
+    """Store the selected mesh elements of objects in an element named selection.
+
+    In edit mode, the edit mesh selection is synced to the mesh first. The current
+    selection replaces the stored elements of an object, is added to them (APPEND)
+    or removed from them (SUBTRACT).
+
+    Returns:
+        int: The number of objects whose stored elements changed.
+    """
+    element_type = named_selection.element_type
+    stored = 0
+
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        if obj.mode == 'EDIT':
+            obj.update_from_editmode()
+        current = read_element_mask(obj.data, element_type)
+
+        member = get_member(named_selection, obj)
+        if member is not None and member.elements and member.element_count == len(current):
+            mask = combine_element_masks(unpack_element_mask(member.elements, member.element_count), current, mode)
+        elif mode == 'SUBTRACT':
+            continue
+        else:
+            mask = current
+
+        if member is None:
+            if not mask.any():
+                continue
+            add_members(named_selection, (obj,))
+            member = get_member(named_selection, obj)
+
+        member.elements = pack_element_mask(mask)
+        member.element_count = len(mask)
+        stored += 1
+
+    note_members_touched(stored)
+    mark_named_selections_changed()
+    return stored
+
+
+def restore_element_selection(context, named_selection, mode='REPLACE'):
+    """Select the stored mesh elements of an element named selection and enter edit mode.
+
+    The masks are written to the meshes in object mode, so edit mode is left first
+    if needed. Objects whose mesh has a different number of elements than when the
+    elements were stored are skipped.
+
+    Returns:
+        tuple: The objects that were restored and the names of the objects skipped.
+    """
+    element_type = named_selection.element_type
+    view_layer = context.view_layer
+    was_editing = context.mode == 'EDIT_MESH'
+    if was_editing:
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    restored, skipped = [], []
+    for member in named_selection.objects:
+        obj = member.object
+        if obj is None or obj.type != 'MESH' or not member.elements:
+            continue
+        mesh = obj.data
+        if len(getattr(mesh, ELEMENT_COLLECTIONS[element_type])) != member.element_count:
+            skipped.append(obj.name)
+            continue
+
+        stored = unpack_element_mask(member.elements, member.element_count)
+        current = read_element_mask(mesh, element_type) if mode != 'REPLACE' else None
+        write_element_selection(mesh, element_type, combine_element_masks(current, stored, mode))
+        restored.append(obj)
+
+    note_members_touched(len(restored))
+
+    if restored:
+        # The restored objects join edit mode together with the ones already in it
+        apply_selection(view_layer, restored, 'APPEND')
+        if view_layer.objects.active not in restored:
+            view_layer.objects.active = restored[0]
+        context.tool_settings.mesh_select_mode = [element_type == t for t in ('VERTEX', 'EDGE', 'FACE')]
+    if restored or was_editing:
+        bpy.ops.object.mode_set(mode='EDIT')
+
+    return restored, skipped
+
+
+# A custom operator that selects the objects in a named selection
+class SelectNamedSelection(Operator):
+    """Operator to select objects from a named selection.
+
+    Selects all objects that are part of a specific named selection in the scene.
+    The named selection can replace the current selection, be appended to it,
+    subtracted from it or intersected with it.
+    """
+    
+    bl_idname = "object.select_named_selection"
+    bl_label = "Select Named Selection"
+    bl_description = ("Select the objects or mesh elements in the named selection. Hold SHIFT to append to, CTRL to "
+                      "subtract from or SHIFT+CTRL to intersect with the current selection.")
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    mode: bpy.props.EnumProperty(name="Mode", items=SELECTION_MODES, default='REPLACE')
+    append: bpy.props.BoolProperty(options={'HIDDEN', 'SKIP_SAVE'})  # Kept for scripts, same as mode 'APPEND'
+    
+    @classmethod
+    def poll(cls, context):
+        return context.scene.named_selections
+
+    def invoke(self, context, event):
+        # The invoke function is called when the operator is called
+        # Here we set the mode based on the Shift and Ctrl key state
+        if event.shift and event.ctrl:
+            self.mode = 'INTERSECT'
+        elif event.shift:
+            self.mode = 'APPEND'
+        elif event.ctrl:
+            self.mode = 'SUBTRACT'
+        else:
+            self.mode = 'REPLACE'
+        return self.execute(context)
+
+    @instrumented
+    def execute(self, context):
+        start = time.perf_counter()
+
+        # Get the scene and the active named selection
+        scene = context.scene
+        if scene.named_selections_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+        named_selection = scene.named_selections[scene.named_selections_index]
+
+        mode = 'APPEND' if self.append else self.mode
+
+        # Element named selections select vertices, edges or faces in edit mode
+        if named_selection.element_type != 'OBJECT':
+            restored, skipped = restore_element_selection(context, named_selection, mode)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            self.report({'WARNING'} if skipped else {'INFO'},
+                        f"{named_selection.name}: elements of {len(restored)} objects restored in {elapsed:.1f} ms"
+                        + (f", skipped changed meshes: {', '.join(skipped)}" if skipped else ""))
+            return {'FINISHED'}
+
+        objects = get_member_objects(named_selection)
+
+        # Only the objects whose selection state changes are touched
+        view_layer = context.view_layer
+        selected, deselected = apply_selection(view_layer, objects, mode)
+
+        # Make sure the active object is set to one of the selected objects
+        if mode == 'REPLACE':
+            for obj in objects:
+                if obj.select_get(view_layer=view_layer):
+                    view_layer.objects.active = obj
+                    break
+
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.report({'INFO'}, f"{named_selection.name}: {selected} selected, {deselected} deselected in {elapsed:.1f} ms")
+
+        return {'FINISHED'}
+
+# A custom operator that removes a named selection
+class RemoveNamedSelection(Operator):
+    """Operator to remove an existing named selection.
+
+    Removes a named selection from the scene. This action does not delete the objects,
+    only the grouping reference.
+    """
+    
+    bl_idname = "object.remove_named_selection"
+    bl_label = "Remove Named Selection"
+    bl_description = "Remove the named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @instrumented
+    def execute(self, context):
+        scene = context.scene
+
+        # Get the index of the currently active named selection
+        active_idx = scene.named_selections_index
+
+        # Check if the index is valid
+        if active_idx < 0 or active_idx >= len(scene.named_selections):
+            self.report({'WARNING'}, "No valid named selection selected")
+            return {'CANCELLED'}
+
+        # Remove the active named selection
+        removed = scene.named_selections[active_idx]
+        update_reverse_index(removed, removed=list(get_stored_objects(removed)))
+        release_storage_collection(removed)
+        invalidate_membership_indices()
+        mark_named_selections_changed()
+        scene.named_selections.remove(active_idx)
+
+        # Update the active index to a valid value
+        if active_idx >= len(scene.named_selections):
+            scene.named_selections_index = len(scene.named_selections) - 1
+        else:
+            scene.named_selections_index = active_idx
+
+        # Force a UI refresh
+        tag_view3d_redraw(context)
+
+        return {'FINISHED'}
+
+# A custom operator that removes an object from a named selection
+class RemoveObjectFromNamedSelection(Operator):
+    """
+    Operator to remove the active object from a named selection.
+
+    This operator allows users to remove the currently active object from a specified named selection.
+    It modifies the named selection to exclude the active object, updating the collection of objects
+    within that selection. The operation is registered for undo/redo capabilities in Blender.
+
+    """
+    bl_idname = "object.remove_object_from_named_selection"
+    bl_label = "Remove Object From Named Selection"
+    bl_description = "Remove the active object from the named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @instrumented
+    def execute(self, context):
+        # Get the scene, the active object and the active named selection
+        scene = context.scene
+        named_selection_index = scene.named_selections_index
+
+        # Ensure there is a valid named selection
+        if named_selection_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+
+        named_selection = scene.named_selections[named_selection_index]
+
+        # In edit mode, the selected elements are removed from an element named selection
+        if named_selection.element_type != 'OBJECT' and context.mode == 'EDIT_MESH':
+            store_element_selection(named_selection, context.objects_in_mode, 'SUBTRACT')
+            return {'FINISHED'}
+
+        # Remove all selected objects that are in the named selection in one batch
+        remove_members(named_selection, context.selected_objects)
+
+        return {'FINISHED'}
+
+# A custom operator that adds an object to a named selection
+class AddObjectToNamedSelection(Operator):
+    bl_idname = "object.add_object_to_named_selection"
+    bl_label = "Add Object To Named Selection"
+    bl_description = "Add the active object to the named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @instrumented
+    def execute(self, context):
+        scene = context.scene
+        named_selection_index = scene.named_selections_index
+
+        # Ensure there is a valid named selection
+        if named_selection_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+
+        named_selection = scene.named_selections[named_selection_index]
+
+        # In edit mode, the selected elements are added to an element named selection
+        if named_selection.element_type != 'OBJECT' and context.mode == 'EDIT_MESH':
+            store_element_selection(named_selection, context.objects_in_mode, 'APPEND')
+            return {'FINISHED'}
+
+        # Add all selected objects that are not already in the named selection
+        add_members(named_selection, context.selected_objects)
+
+        return {'FINISHED'}
+
+
+class ClearNamedSelection(Operator):
+    bl_idname = "object.clear_named_selection"
+    bl_label = "Clear Named Selection"
+    bl_description = "Clear all objects from the named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @instrumented
+    def execute(self, context):
+        scene = context.scene
+        named_selection_index = scene.named_selections_index
+
+        # Ensure there is a valid named selection
+        if named_selection_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+
+        named_selection = scene.named_selections[named_selection_index]
+        
+        # Clear all objects from the named selection
+        clear_members(named_selection)
+
+        return {'FINISHED'}
+    
+class RenameNamedSelection(Operator):
+    bl_idname = "object.rename_named_selection"
+    bl_label = "Rename Named Selection"
+    bl_description = "Rename the selected named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    new_name: bpy.props.StringProperty(name="New Name")
+
+    @instrumented
+    def execute(self, context):
+        scene = context.scene
+        named_selection_index = scene.named_selections_index
+
+        # Ensure there is a valid named selection
+        if named_selection_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+
+        # Rename the named selection
+        named_selection = scene.named_selections[named_selection_index]
+        named_selection.name = self.new_name
+        mark_named_selections_changed()
+        
+         # Force a UI refresh
+        tag_view3d_redraw(context)
+
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        named_selection_index = context.scene.named_selections_index
+        if named_selection_index < len(context.scene.named_selections):
+            self.new_name = context.scene.named_selections[named_selection_index].name
+        return context.window_manager.invoke_props_dialog(self)
+
+
+# A custom operator that adds a rule to the active named selection
+class AddNamedSelectionRule(Operator):
+    """Operator to add a rule to the active named selection.
+
+    Rules turn a named selection into a dynamic one, whose members are found by
+    matching the objects of the scene when the selection is used.
+    """
+
+    bl_idname = "object.add_named_selection_rule"
+    bl_label = "Add Rule"
+    bl_description = "Add a rule that matches objects to the named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @instrumented
+    def execute(self, context):
+        scene = context.scene
+        named_selection_index = scene.named_selections_index
+
+        # Ensure there is a valid named selection
+        if named_selection_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+
+        named_selection = scene.named_selections[named_selection_index]
+        named_selection.rules.add()
+        named_selection.use_rules = True
+        mark_named_selections_changed()
+
+        return {'FINISHED'}
+
+
+# A custom operator that removes a rule from the active named selection
+class RemoveNamedSelectionRule(Operator):
+    bl_idname = "object.remove_named_selection_rule"
+    bl_label = "Remove Rule"
+    bl_description = "Remove the rule from the named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty(name="Index", options={'HIDDEN'})
+
+    @instrumented
+    def execute(self, context):
+        scene = context.scene
+        named_selection_index = scene.named_selections_index
+
+        # Ensure there is a valid named selection and rule
+        if named_selection_index >= len(scene.named_selections):
+            self.report({'WARNING'}, "No named selection selected")
+            return {'CANCELLED'}
+
+        named_selection = scene.named_selections[named_selection_index]
+        if not 0 <= self.index < len(named_selection.rules):
+            self.report({'WARNING'}, "No such rule")
+            return {'CANCELLED'}
+
+        named_selection.rules.remove(self.index)
+        mark_named_selections_changed()
+
+        return {'FINISHED'}
+
+
+# A custom operator that selects the objects of every named selection containing the active object
+class SelectContainingNamedSelections(Operator):
+    """Operator to select the objects of all named selections that contain the active object.
+
+    The named selections are found through the reverse index, and their objects are
+    combined as bitsets before the selection is changed once.
+    """
+
+    bl_idname = "object.select_containing_named_selections"
+    bl_label = "Select Containing Named Selections"
+    bl_description = ("Select the objects of all named selections that contain the active object. "
+                      "Hold SHIFT to append to the current selection")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: EnumProperty(name="Mode", items=SELECTION_MODES, default='REPLACE')
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None and context.mode == 'OBJECT'
+
+    def invoke(self, context, event):
+        self.mode = 'APPEND' if event.shift else 'REPLACE'
+        return self.execute(context)
+
+    @instrumented
+    def execute(self, context):
+        active_object = context.active_object
+        containing = get_containing_selections(context.scene, active_object)
+        if not containing:
+            self.report({'WARNING'}, f"{active_object.name} is in no named selection")
+            return {'CANCELLED'}
+
+        bits = 0
+        for named_selection in containing:
+            bits |= get_selection_bitset(named_selection)
+        selected, deselected = apply_selection(context.view_layer, get_bitset_objects(bits), self.mode)
+
+        self.report({'INFO'}, f"{len(containing)} named selections: {selected} selected, {deselected} deselected")
+        return {'FINISHED'}
+
+
+# A custom operator that removes the active object from every named selection
+class RemoveFromAllNamedSelections(Operator):
+    bl_idname = "object.remove_from_all_named_selections"
+    bl_label = "Remove From All Named Selections"
+    bl_description = "Remove the active object from all named selections that contain it"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None
+
+    @instrumented
+    def execute(self, context):
+        active_object = context.active_object
+        uids = set(get_reverse_index(context.scene).get(active_object))
+
+        # Objects matched by rules stay in their named selections until the rules change
+        removed = 0
+        for named_selection in context.scene.named_selections:
+            if named_selection.uid in uids:
+                removed += remove_members(named_selection, (active_object,))
+
+        self.report({'INFO'}, f"Removed {active_object.name} from {removed} named selections")
+        return {'FINISHED'}
+
+
+# Actions that can be applied to all objects of a named selection at once
+BULK_ACTIONS = [
+    ('HIDE', "Hide", "Hide the objects in the viewport", 'HIDE_ON', 0),
+    ('SHOW', "Show", "Show the objects in the viewport", 'HIDE_OFF', 1),
+    ('DISABLE_RENDER', "Disable in Renders", "Exclude the objects from renders", 'RESTRICT_RENDER_ON', 2),
+    ('ENABLE_RENDER', "Enable in Renders", "Include the objects in renders", 'RESTRICT_RENDER_OFF', 3),
+    ('LOCK', "Lock", "Make the objects unselectable in the viewport", 'RESTRICT_SELECT_ON', 4),
+    ('UNLOCK', "Unlock", "Make the objects selectable in the viewport", 'RESTRICT_SELECT_OFF', 5),
+    ('MOVE_TO_COLLECTION', "Move to Collection", "Link the objects to a collection and unlink them from the "
+                                                 "other collections of the scene", 'OUTLINER_COLLECTION', 6),
+    ('ASSIGN_MATERIAL', "Assign Material", "Assign a material to all material slots of the objects", 'MATERIAL', 7),
+]
+
+# The bulk actions that set a boolean property of the objects, with the property and its value
+BULK_ACTION_FLAGS = {
+    'DISABLE_RENDER': ("hide_render", True),
+    'ENABLE_RENDER': ("hide_render", False),
+    'LOCK': ("hide_select", True),
+    'UNLOCK': ("hide_select", False),
+}
+
+
+def set_member_flags(named_selection, attribute, value):
+    """Set a boolean property on all objects of a named selection.
+
+    The static members of an object named selection are written with a single
+    foreach_set call on its storage collection; only the objects matched by rules
+    and the members of element named selections are written one by one.
+
+    Returns:
+        int: The number of objects whose property changed.
+    """
+    storage = named_selection.storage if uses_compact_storage(named_selection) else None
+    changed = 0
+
+    if storage is not None and storage.objects:
+        count = len(storage.objects)
+        flags = [False] * count
+        storage.objects.foreach_get(attribute, flags)
+        changed = count - flags.count(value)
+        if changed:
+            storage.objects.foreach_set(attribute, [value] * count)
+            # foreach_set skips the RNA update, so the flag is assigned once more on one
+            # changed object to sync the collections and tag the depsgraph a single time
+            setattr(storage.objects[flags.index(not value)], attribute, value)
+        note_members_touched(count)
+        others = [obj for obj in get_rule_objects(named_selection)
+                  if not contains_member(named_selection, obj)] if named_selection.use_rules else ()
+    else:
+        others = get_member_objects(named_selection)
+
+    for obj in others:
+        if getattr(obj, attribute) != value:
+            setattr(obj, attribute, value)
+            changed += 1
+
+    return changed
+
+
+def set_objects_hidden(view_layer, objects, hide):
+    """Hide or show objects in a view layer, skipping the ones already in that state.
+
+    Blender has no batched form of hide_set, and each call may resync the view layer,
+    which takes time proportional to the number of objects in the scene. Hiding a
+    large named selection can therefore grow quadratically with its size; the stand-in
+    benchmarks do not model the resync, so measure this case inside Blender.
+
+    Returns:
+        int: The number of objects that were hidden or shown.
+    """
+    changed = 0
+    for obj in objects:
+        try:
+            if obj.hide_get(view_layer=view_layer) != hide:
+                obj.hide_set(hide, view_layer=view_layer)
+                changed += 1
+        except RuntimeError:
+            # The object is not in this view layer
+            continue
+    return changed
+
+
+def get_scene_collections(scene):
+    """Return the master collection of a scene and all collections nested in it.
+
+    Walks the children by hand, since Collection.children_recursive needs Blender 3.1.
+    """
+    collections = {scene.collection: None}
+    pending = [scene.collection]
+    while pending:
+        for child in pending.pop().children:
+            if child not in collections:
+                collections[child] = None
+                pending.append(child)
+    return list(collections)
+
+
+def move_objects_to_collection(scene, objects, collection):
+    """Link objects to a collection and unlink them from the other collections of a scene.
+
+    Storage collections of named selections are left alone, so the objects stay
+    members of their named selections.
+
+    Like hide_set, linking and unlinking have no batched form and each call may resync
+    the collections of the file, so moving a large named selection can grow
+    quadratically with its size.
+
+    Returns:
+        int: The number of objects that were moved.
+    """
+    scene_collections = set(get_scene_collections(scene))
+    moved = 0
+    for obj in objects:
+        linked = collection in obj.users_collection
+        if not linked:
+            collection.objects.link(obj)
+        others = [other for other in obj.users_collection
+                  if other != collection and other in scene_collections]
+        for other in others:
+            other.objects.unlink(obj)
+        moved += not linked or bool(others)
+    return moved
+
+
+def assign_material(objects, material):
+    """Assign a material to all material slots of objects.
+
+    Objects without slots get one added to their data, once per data block shared
+    by several objects.
+
+    Returns:
+        int: The number of objects whose materials changed.
+    """
+    extended = set()
+    changed = 0
+    for obj in objects:
+        data = obj.data
+        if data is None or not hasattr(data, "materials"):
+            continue
+        if not obj.material_slots:
+            if data not in extended:
+                extended.add(data)
+                data.materials.append(material)
+            changed += 1
+            continue
+        slots = [slot for slot in obj.material_slots if slot.material != material]
+        for slot in slots:
+            slot.material = material
+        changed += bool(slots)
+    return changed
+
+
+def apply_bulk_action(context, named_selection, action, collection=None, material=None):
+    """Apply one of the BULK_ACTIONS to all objects of a named selection.
+
+    Everything goes through the data API instead of operators, so no context has to
+    be overridden and the caller gets a single undo step for the whole action.
+
+    Args:
+        context (Context): The context whose view layer hide and show apply to.
+        named_selection (NamedSelection): The named selection whose objects are changed.
+        action (str): One of the identifiers in BULK_ACTIONS.
+        collection (Collection): The target collection of 'MOVE_TO_COLLECTION'.
+        material (Material): The material of 'ASSIGN_MATERIAL'.
+
+    Returns:
+        int: The number of objects that changed.
+    """
+    if action in BULK_ACTION_FLAGS:
+        return set_member_flags(named_selection, *BULK_ACTION_FLAGS[action])
+
+    objects = get_member_objects(named_selection)
+    if action in {'HIDE', 'SHOW'}:
+        return set_objects_hidden(context.view_layer, objects, action == 'HIDE')
+    if action == 'MOVE_TO_COLLECTION':
+        if collection is None:
+            raise ValueError("Moving to a collection needs a collection")
+        return move_objects_to_collection(context.scene, objects, collection)
+    if action == 'ASSIGN_MATERIAL':
+        if material is None:
+            raise ValueError("Assigning a material needs a material")
+        return assign_material(objects, material)
+    raise ValueError(f"Unknown bulk action: {action}")
+
+
+# A custom operator that applies an action to all objects of the active named selection
+class NamedSelectionBulkAction(Operator):
+    """Operator to hide, show, lock, move or assign a material to the objects of a named selection.
+
+    Works on the objects directly instead of selecting them first, so the current
+    selection is kept and the whole action is a single undo step.
+    """
+
+    bl_idname = "object.named_selection_bulk_action"
+    bl_label = "Named Selection Action"
+    bl_description = "Apply an action to all objects of the active named selection without selecting them"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    action: EnumProperty(name="Action", items=BULK_ACTIONS, default='HIDE')
+    collection: StringProperty(name="Collection")
+    material: StringProperty(name="Material")
+
+    @classmethod
+    def poll(cls, context):
+        scene = context.scene
+        return context.mode == 'OBJECT' and 0 <= scene.named_selections_index < len(scene.named_selections)
+
+    def invoke(self, context, event):
+        # Only the actions with a target ask for it
+        if self.action in {'MOVE_TO_COLLECTION', 'ASSIGN_MATERIAL'}:
+            return context.window_manager.invoke_props_dialog(self)
+        return self.execute(context)
+
+    def draw(self, context):
+        layout = self.layout
+        if self.action == 'MOVE_TO_COLLECTION':
+            layout.prop_search(self, "collection", bpy.data, "collections")
+        elif self.action == 'ASSIGN_MATERIAL':
+            layout.prop_search(self, "material", bpy.data, "materials")
+
+    @instrumented
+    def execute(self, context):
+        start = time.perf_counter()
+        named_selection = context.scene.named_selections[context.scene.named_selections_index]
+
+        collection = material = None
+        if self.action == 'MOVE_TO_COLLECTION':
+            collection = bpy.data.collections.get(self.collection)
+            if collection is None or collection.name.startswith(STORAGE_COLLECTION_PREFIX):
+                self.report({'WARNING'}, "Choose a collection")
+                return {'CANCELLED'}
+        elif self.action == 'ASSIGN_MATERIAL':
+            material = bpy.data.materials.get(self.material)
+            if material is None:
+                self.report({'WARNING'}, "Choose a material")
+                return {'CANCELLED'}
+
+        changed = apply_bulk_action(context, named_selection, self.action, collection, material)
+
+        elapsed = (time.perf_counter() - start) * 1000.0
+        label = next(name for identifier, name, *_ in BULK_ACTIONS if identifier == self.action)
+        self.report({'INFO'}, f"{named_selection.name}: {label} changed {changed} objects in {elapsed:.1f} ms")
+        return {'FINISHED'}
+
+
+# A custom operator that clears the recorded hot path statistics
+class ResetNamedSelectionStats(Operator):
+    bl_idname = "wm.reset_named_selection_stats"
+    bl_label = "Reset Statistics"
+    bl_description = "Forget all recorded timing statistics of the Named Selection addon"
+
+    @instrumented
+    def execute(self, context):
+        reset_hot_path_stats()
+        return {'FINISHED'}
+
+
+# A custom operator that writes the recorded hot path statistics to a JSON file
+class DumpNamedSelectionStats(Operator):
+    """Operator to save the recorded hot path statistics.
+
+    Writes the call counts, latency percentiles and histograms and the number of
+    members touched of every instrumented function, and the event counters, to a
+    JSON file.
+    """
+
+    bl_idname = "wm.dump_named_selection_stats"
+    bl_label = "Save Statistics"
+    bl_description = "Save the recorded timing statistics of the Named Selection addon to a JSON file"
+
+    filepath: StringProperty(subtype='FILE_PATH', default="named_selection_stats.json")
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    @instrumented
+    def execute(self, context):
+        stats = {
+            "functions": {name: entry.as_dict() for name, entry in get_hot_path_stats().items()},
+            "counters": dict(get_event_counters()),
+        }
+        with open(bpy.path.abspath(self.filepath), "w") as stats_file:
+            json.dump(stats, stats_file, indent=2)
+        self.report({'INFO'}, f"Statistics saved to {self.filepath}")
+        return {'FINISHED'}
+
+
+# A custom operator that reports the estimated size of the named selection members
+class ReportNamedSelectionStorage(Operator):
+    """Operator to report how much memory the members of the named selections take.
+
+    The estimate covers the .blend file and each undo step, which holds a copy of the
+    members, and compares the current layout with property group members.
+    """
+
+    bl_idname = "wm.report_named_selection_storage"
+    bl_label = "Storage Size"
+    bl_description = "Report the estimated size of the named selection members in the file and in each undo step"
+
+    @instrumented
+    def execute(self, context):
+        report = get_storage_report(context.scene)
+        self.report({'INFO'}, f"{report['members']} members take about {report['current_bytes'] / 1024.0:.1f} KiB "
+                              f"({report['item_bytes'] / 1024.0:.1f} KiB as property groups)")
+        return {'FINISHED'}
+
+
+class ObjectIndexer:
+    """Assigns dense indices to objects so that sets of objects can be stored as bitsets.
+
+    Objects get the next free index the first time they are seen. The indexer is
+    shared by all named selections and reset after file load, undo and redo.
+
+    Attributes:
+        indices (dict): Maps each object seen so far to its index.
+        objects (list): The objects seen so far, by index.
+    """
+
+    __slots__ = ("indices", "objects")
+
+    def __init__(self):
+        self.indices = {}
+        self.objects = []
+
+    def index_of(self, obj):
+        index = self.indices.get(obj)
+        if index is None:
+            index = self.indices[obj] = len(self.objects)
+            self.objects.append(obj)
+        return index
+
+
+_object_indexer = {"indexer": ObjectIndexer()}
+
+# The bitset of each named selection, by address, with the revision it was built at
+_bitsets = {}
+
+
+def get_object_indexer():
+    """Return the object indexer shared by all bitsets."""
+    return _object_indexer["indexer"]
+
+
+def reset_bitsets():
+    """Forget all bitsets and object indices."""
+    _object_indexer["indexer"] = ObjectIndexer()
+    _bitsets.clear()
+
+
+def get_selection_bitset(named_selection):
+    """Return the members of a named selection as a bitset of object indices.
+
+    Bit i of the returned int is set when get_object_indexer().objects[i] is a member.
+    The bitset is cached until the named selections change.
+    """
+    key = named_selection.as_pointer()
+    cached = _bitsets.get(key)
+    if cached is not None and cached[0] == get_revision():
+        return cached[1]
+
+    bits = get_objects_bitset(get_member_objects(named_selection))
+    _bitsets[key] = (get_revision(), bits)
+    return bits
+
+
+def get_objects_bitset(objects):
+    """Return a set of objects as a bitset of object indices, indexing new objects on the way."""
+    indexer = get_object_indexer()
+    indices = [indexer.index_of(obj) for obj in objects]
+    return get_indices_bitset(indices, len(indexer.objects))
+
+
+def get_indices_bitset(indices, size):
+    """Return a bitset with the given bits set; size is an upper bound for the indices."""
+    # Setting bits in a byte buffer and converting once avoids building an
+    # ever growing int for every member
+    buffer = bytearray((size + 7) // 8)
+    for index in indices:
+        buffer[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def get_bitset_indices(bits):
+    """Return the indices of the bits set in a bitset, in ascending order."""
+    result = []
+    buffer = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(buffer):
+        if not byte:
+            continue
+        base = byte_index << 3
+        for bit in range(8):
+            if byte >> bit & 1:
+                result.append(base + bit)
+    return result
+
+
+def get_bitset_objects(bits):
+    """Return the objects whose bits are set in a bitset, in index order."""
+    objects = get_object_indexer().objects
+    return [objects[index] for index in get_bitset_indices(bits)]
+
+
+# The set operations that can combine two named selections
+SET_OPERATIONS = [
+    ('UNION', "Union", "Objects that are in either named selection"),
+    ('INTERSECTION', "Intersection", "Objects that are in both named selections"),
+    ('DIFFERENCE', "Difference", "Objects that are in the first named selection but not in the second"),
+]
+
+# The symbols used to name the result of a set operation
+SET_OPERATION_SYMBOLS = {'UNION': "|", 'INTERSECTION': "&", 'DIFFERENCE': "-"}
+
+
+def combine_named_selections(first, second, operation):
+    """Combine the members of two named selections with a set operation.
+
+    Args:
+        first (NamedSelection): The left operand.
+        second (NamedSelection): The right operand.
+        operation (str): One of the identifiers in SET_OPERATIONS.
+
+    Returns:
+        list: The objects in the result.
+    """
+    first_bits = get_selection_bitset(first)
+    second_bits = get_selection_bitset(second)
+
+    if operation == 'UNION':
+        bits = first_bits | second_bits
+    elif operation == 'INTERSECTION':
+        bits = first_bits & second_bits
+    elif operation == 'DIFFERENCE':
+        bits = first_bits & ~second_bits
+    else:
+        raise ValueError(f"Unknown set operation: {operation}")
+
+    return get_bitset_objects(bits)
+
+
+# A custom operator that combines two named selections with a set operation
+class CombineNamedSelections(Operator):
+    """Operator to combine two named selections.
+
+    Computes the union, intersection or difference of two named selections and
+    either selects the resulting objects or stores them as a new named selection.
+    """
+
+    bl_idname = "object.combine_named_selections"
+    bl_label = "Combine Named Selections"
+    bl_description = "Combine two named selections and select the result or save it as a new named selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    first: StringProperty(name="First")
+    second: StringProperty(name="Second")
+    operation: EnumProperty(name="Operation", items=SET_OPERATIONS, default='UNION')
+    action: EnumProperty(
+        name="Result",
+        items=[
+            ('SELECT', "Select", "Select the resulting objects"),
+            ('NEW', "New Named Selection", "Store the resulting objects as a new named selection"),
+        ],
+        default='SELECT'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.named_selections
+
+    def invoke(self, context, event):
+        # Start from the active named selection
+        scene = context.scene
+        if scene.named_selections_index < len(scene.named_selections):
+            self.first = scene.named_selections[scene.named_selections_index].name
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        layout.prop_search(self, "first", scene, "named_selections")
+        layout.prop(self, "operation", expand=True)
+        layout.prop_search(self, "second", scene, "named_selections")
+        layout.prop(self, "action", expand=True)
+
+    @instrumented
+    def execute(self, context):
+        start = time.perf_counter()
+        scene = context.scene
+
+        first = scene.named_selections.get(self.first)
+        second = scene.named_selections.get(self.second)
+        if first is None or second is None:
+            self.report({'WARNING'}, "Choose two existing named selections")
+            return {'CANCELLED'}
+
+        objects = combine_named_selections(first, second, self.operation)
+
+        if self.action == 'SELECT':
+            apply_selection(context.view_layer, objects, 'REPLACE')
+        else:
+            name = generate_unique_name(scene, f"{first.name} {SET_OPERATION_SYMBOLS[self.operation]} {second.name}")
+            add_members(new_named_selection(scene, name), objects)
+            scene.named_selections_index = len(scene.named_selections) - 1
+            tag_view3d_redraw(context)
+
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.report({'INFO'}, f"{len(objects)} objects in result, computed in {elapsed:.1f} ms")
+
+        return {'FINISHED'}
+
+
+# The scene structures named selections can be generated from
+GENERATOR_SOURCES = [
+    ('COLLECTION', "Collections", "One named selection per collection", 'OUTLINER_COLLECTION', 0),
+    ('MATERIAL', "Materials", "One named selection per material", 'MATERIAL', 1),
+    ('PROPERTY', "Property Values", "One named selection per value of a custom property", 'PROPERTIES', 2),
+]
+
+
+def get_parent_collections(scene):
+    """Map each collection of a scene to the collections that directly contain it."""
+    parents = {}
+    for parent in get_scene_collections(scene):
+        for child in parent.children:
+            parents.setdefault(child, []).append(parent)
+    return parents
+
+
+def group_objects(scene, source, property_name="", nested=True):
+    """Group the objects of a scene by collection, material or custom property value.
+
+    The objects are visited once. With nested, objects also count towards the parent
+    collections of their collections, like Collection.all_objects does.
+
+    Returns:
+        dict: Maps the generator key of each group to its label and its objects.
+    """
+    groups = {}
+
+    def add(key, label, obj):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = (label, {})
+        group[1][obj] = None
+
+    if source == 'COLLECTION':
+        parents = get_parent_collections(scene) if nested else {}
+        master = scene.collection
+        for obj in scene.objects:
+            pending = list(obj.users_collection)
+            seen = set()
+            while pending:
+                collection = pending.pop()
+                if collection in seen or collection == master:
+                    continue
+                seen.add(collection)
+                # Storage collections of named selections are not part of the scene
+                if collection.name.startswith(STORAGE_COLLECTION_PREFIX):
+                    continue
+                add(f"COLLECTION:{collection.name}", collection.name, obj)
+                pending.extend(parents.get(collection, ()))
+
+    elif source == 'MATERIAL':
+        for obj in scene.objects:
+            for slot in obj.material_slots:
+                if slot.material is not None:
+                    add(f"MATERIAL:{slot.material.name}", slot.material.name, obj)
+
+    elif source == 'PROPERTY':
+        if not property_name:
+            raise ValueError("Grouping by property values needs a property name")
+        for obj in scene.objects:
+            value = get_property_text(obj.get(property_name))
+            if value is not None:
+                add(f"PROPERTY:{property_name}={value}", f"{property_name}: {value}", obj)
+
+    else:
+        raise ValueError(f"Unknown generator source: {source}")
+
+    note_members_touched(len(scene.objects))
+    return {key: (label, list(objects)) for key, (label, objects) in groups.items()}
+
+
+def generate_named_selections(scene, source, property_name="", nested=True, prefix="", remove_stale=True):
+    """Create or update one named selection per group of objects of a scene.
+
+    Named selections generated before are found by their generator key and only
+    changed when their group changed, so running the generator again is cheap.
+    Named selections whose group is gone are removed with remove_stale.
+
+    Returns:
+        dict: The number of named selections created, updated, removed and unchanged.
+    """
+    groups = group_objects(scene, source, property_name, nested)
+    key_prefix = f"{source}:"
+    if source == 'PROPERTY':
+        key_prefix = f"PROPERTY:{property_name}="
+    counts = {"created": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+    # Existing named selections are changed before any are added or removed, since both
+    # move the items of the collection property the references point into
+    stale = []
+    for index, named_selection in enumerate(scene.named_selections):
+        key = named_selection.generator_key
+        if not key.startswith(key_prefix):
+            continue
+        group = groups.pop(key, None)
+        if group is None:
+            stale.append(index)
+            continue
+
+        current = set(get_stored_objects(named_selection))
+        target = set(group[1])
+        if current == target:
+            counts["unchanged"] += 1
+            continue
+        remove_members(named_selection, current - target)
+        add_members(named_selection, [obj for obj in group[1] if obj not in current])
+        counts["updated"] += 1
+
+    if remove_stale and stale:
+        for index in reversed(stale):
+            named_selection = scene.named_selections[index]
+            update_reverse_index(named_selection, removed=list(get_stored_objects(named_selection)))
+            release_storage_collection(named_selection)
+            scene.named_selections.remove(index)
+        invalidate_membership_indices()
+        mark_named_selections_changed()
+        scene.named_selections_index = min(scene.named_selections_index, len(scene.named_selections) - 1)
+        counts["removed"] = len(stale)
+
+    allocator = UniqueNameAllocator(ns.name for ns in scene.named_selections)
+    for key, (label, objects) in groups.items():
+        named_selection = new_named_selection(scene, allocator.allocate(f"{prefix}{label}"))
+        named_selection.generator_key = key
+        add_members(named_selection, objects)
+        counts["created"] += 1
+
+    return counts
+
+
+# A custom operator that generates named selections from collections, materials or custom properties
+class GenerateNamedSelections(Operator):
+    """Operator to generate a named selection per collection, material or custom property value.
+
+    The objects of the scene are grouped in a single pass and all named selections
+    are created in one batch. Running it again only updates the named selections
+    whose group changed.
+    """
+
+    bl_idname = "object.generate_named_selections"
+    bl_label = "Generate Named Selections"
+    bl_description = "Create or update a named selection for each collection, material or custom property value"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source: EnumProperty(name="From", items=GENERATOR_SOURCES, default='COLLECTION')
+    property_name: StringProperty(name="Property", description="The custom property whose values are grouped")
+    nested: BoolProperty(
+        name="Include Child Collections",
+        description="Also include the objects of child collections",
+        default=True
+    )
+    prefix: StringProperty(name="Prefix", description="Put in front of the names of new named selections")
+    remove_stale: BoolProperty(
+        name="Remove Stale",
+        description="Remove generated named selections whose collection, material or value is gone",
+        default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "source", expand=True)
+        if self.source == 'PROPERTY':
+            layout.prop(self, "property_name")
+        elif self.source == 'COLLECTION':
+            layout.prop(self, "nested")
+        layout.prop(self, "prefix")
+        layout.prop(self, "remove_stale")
+
+    @instrumented
+    def execute(self, context):
+        start = time.perf_counter()
+        if self.source == 'PROPERTY' and not self.property_name:
+            self.report({'WARNING'}, "Enter the name of a custom property")
+            return {'CANCELLED'}
+
+        counts = generate_named_selections(context.scene, self.source, self.property_name, self.nested,
+                                           self.prefix, self.remove_stale)
+        tag_view3d_redraw(context)
+
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.report({'INFO'}, f"{counts['created']} created, {counts['updated']} updated, {counts['removed']} removed, "
+                              f"{counts['unchanged']} unchanged in {elapsed:.1f} ms")
+        return {'FINISHED'}
+
+
+# Seconds without selection changes before the selection is captured into the history,
+# so a burst of clicks becomes a single snapshot
+SELECTION_CAPTURE_DEBOUNCE_INTERVAL = 0.3
+
+# Approximate bytes a snapshot takes besides its delta
+SNAPSHOT_OVERHEAD_BYTES = 64
+
+
+def encode_selection_delta(delta):
+    """Return the smaller of a delta bitset and the array of its set bit indices, with its size in bytes."""
+    indices = get_bitset_indices(delta)
+    bitset_bytes = (delta.bit_length() + 7) // 8
+    if len(indices) * 4 < bitset_bytes:
+        encoded = array.array('I', indices)
+        return encoded, len(indices) * 4
+    return delta, bitset_bytes
+
+
+def decode_selection_delta(encoded):
+    """Return the delta bitset of an encoded delta."""
+    if isinstance(encoded, int):
+        return encoded
+    return get_indices_bitset(encoded, max(encoded) + 1 if encoded else 0)
+
+
+class SelectionHistory:
+    """The recent selection states of a view layer, newest first.
+
+    The newest state is kept as a bitset of object indices. Each older state is kept
+    as the delta to the state after it, either as a bitset or as the indices of the
+    changed bits, whichever is smaller, so selecting a few more objects in a large
+    scene costs a few bytes. The oldest snapshots are evicted first when there are too
+    many or they take too much memory.
+
+    Attributes:
+        latest (int): The newest state as a bitset, or None before the first capture.
+        latest_count (int): The number of objects selected in the newest state.
+        latest_time (float): When the newest state was captured, from time.time().
+        entries (deque): The older states, oldest first, as (encoded delta, size in bytes,
+            object count, capture time) tuples.
+        size (int): The approximate bytes taken by all snapshots.
+    """
+
+    __slots__ = ("latest", "latest_count", "latest_time", "entries", "size")
+
+    def __init__(self):
+        self.latest = None
+        self.latest_count = 0
+        self.latest_time = 0.0
+        self.entries = collections.deque()
+        self.size = 0
+
+    def __len__(self):
+        return len(self.entries) + (self.latest is not None)
+
+    def push(self, bits, count, max_snapshots, max_bytes):
+        """Add a state as the newest snapshot, unless it equals the newest one.
+
+        Returns:
+            bool: Whether a snapshot was added.
+        """
+        if bits == self.latest:
+            return False
+
+        if self.latest is not None:
+            encoded, delta_bytes = encode_selection_delta(self.latest ^ bits)
+            self.entries.append((encoded, delta_bytes, self.latest_count, self.latest_time))
+            self.size += delta_bytes + SNAPSHOT_OVERHEAD_BYTES
+            self.size -= (self.latest.bit_length() + 7) // 8
+
+        self.latest = bits
+        self.latest_count = count
+        self.latest_time = time.time()
+        self.size += (bits.bit_length() + 7) // 8 + (SNAPSHOT_OVERHEAD_BYTES if len(self) == 1 else 0)
+
+        # The newest state is never evicted
+        while self.entries and (len(self) > max_snapshots or self.size > max_bytes):
+            _, delta_bytes, _, _ = self.entries.popleft()
+            self.size -= delta_bytes + SNAPSHOT_OVERHEAD_BYTES
+            count_event("snapshots evicted")
+        count_event("snapshots captured")
+        return True
+
+    def get(self, index):
+        """Return the state of a snapshot as a bitset; 0 is the newest."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"No selection snapshot {index}")
+        bits = self.latest
+        for position in range(1, index + 1):
+            bits ^= decode_selection_delta(self.entries[-position][0])
+        return bits
+
+    def describe(self):
+        """Return the object count and capture time of each snapshot, newest first."""
+        if self.latest is None:
+            return []
+        snapshots = [(self.latest_count, self.latest_time)]
+        snapshots.extend((count, captured) for _, _, count, captured in reversed(self.entries))
+        return snapshots
+
+
+# The selection history of each view layer, by address; cleared with the object indices
+# after file load, undo and redo
+_selection_histories = {}
+
+# The monotonic time at which the pending selection capture may run
+_selection_capture = {"deadline": 0.0}
+
+
+def get_selection_history(view_layer):
+    """Return the selection history of a view layer."""
+    key = view_layer.as_pointer()
+    history = _selection_histories.get(key)
+    if history is None:
+        history = _selection_histories[key] = SelectionHistory()
+    return history
+
+
+def capture_selection(view_layer, window_manager):
+    """Add the current selection of a view layer to its history if it changed.
+
+    Returns:
+        tuple: The selection as a bitset and whether a snapshot was added.
+    """
+    selected = view_layer.objects.selected
+    note_members_touched(len(selected))
+    bits = get_objects_bitset(selected)
+    added = get_selection_history(view_layer).push(
+        bits, len(selected), window_manager.named_selection_history_size,
+        window_manager.named_selection_history_memory * 1024)
+    return bits, added
+
+
+def apply_selection_bitset(view_layer, current, target):
+    """Change the selection of a view layer from one bitset to another.
+
+    Only the objects whose bits differ are visited, which the bitsets tell without
+    building sets of the selected and target objects.
+
+    Returns:
+        tuple: The number of objects that were selected and deselected.
+    """
+    changed = current ^ target
+    selected = deselected = 0
+    for state, bits in ((True, target & changed), (False, current & changed)):
+        for obj in get_bitset_objects(bits):
+            try:
+                obj.select_set(state, view_layer=view_layer)
+            except (RuntimeError, ReferenceError):
+                # The object was deleted or is not in this view layer
+                continue
+            if state:
+                selected += 1
+            else:
+                deselected += 1
+    note_members_touched(selected + deselected)
+    return selected, deselected
 
-        return {'FINISHED'}
-    
-    def generate_unique_name(self, scene):
-        base_name = "Unnamed"
-        existing_names = {ns.name for ns in scene.named_selections}
-        
-        if base_name not in existing_names:
-            return base_name
 
-        # Increment the suffix until an unused name is found
-        counter = 1
-        while f"{base_name}.{str(counter).zfill(2)}" in existing_names:
-            counter += 1
+def get_snapshot_objects(view_layer, index):
+    """Return the objects of a selection snapshot that are still linked into a scene, or None."""
+    history = get_selection_history(view_layer)
+    if not 0 <= index < len(history):
+        return None
+    linked = get_scene_objects()
+    return [obj for obj in get_bitset_objects(history.get(index)) if obj in linked]
 
-        return f"{base_name}.{str(counter).zfill(2)}"
 
-    def invoke(self, context, event):
-        # Show a dialog to enter the name of the new named selection
-        scene = context.scene
-        self.name = self.generate_unique_name(scene)
-        return context.window_manager.invoke_props_dialog(self)
+# A timer function that captures the selection once the selection changes settle
+def capture_pending_selection():
+    remaining = _selection_capture["deadline"] - time.monotonic()
+    if remaining > 0.0:
+        return remaining
 
-# A custom operator that selects the objects in a named selection
-class SelectNamedSelection(Operator):
-    """Operator to select objects from a named selection.
+    context = bpy.context
+    if context.view_layer is not None and context.window_manager is not None:
+        capture_selection(context.view_layer, context.window_manager)
+    return None
 
-    Selects all objects that are part of a specific named selection in the scene.
-    Supports appending to the current selection.
+
+def schedule_selection_capture(delay=SELECTION_CAPTURE_DEBOUNCE_INTERVAL):
+    """Capture the selection after delay seconds without further requests."""
+    _selection_capture["deadline"] = time.monotonic() + delay
+    if not bpy.app.timers.is_registered(capture_pending_selection):
+        bpy.app.timers.register(capture_pending_selection, first_interval=delay)
+
+
+# A custom operator that restores a selection from the history
+class RestoreSelectionSnapshot(Operator):
+    """Operator to restore a selection from the selection history.
+
+    The current selection is captured first and the restored one is added right away,
+    without waiting for the capture timer. Restoring the previous selection twice
+    therefore always toggles between the last two selections.
     """
-    
-    bl_idname = "object.select_named_selection"
-    bl_label = "Select Named Selection"
-    bl_description = "Select the objects in the named selection. Hold SHIFT to append to current selection."
+
+    bl_idname = "object.restore_selection_snapshot"
+    bl_label = "Restore Selection"
+    bl_description = "Restore a recent selection from the selection history"
     bl_options = {'REGISTER', 'UNDO'}
-    
-    append: bpy.props.BoolProperty()  # Add a property to store the append state
-    
+
+    index: IntProperty(name="Snapshot", description="Which snapshot to restore; 1 is the previous selection",
+                       default=1, min=0)
+
     @classmethod
     def poll(cls, context):
-        return context.scene.named_selections
-
-    def invoke(self, context, event):
-        # The invoke function is called when the operator is called
-        # Here we set the append property based on the Shift key state
-        self.append = event.shift
-        return self.execute(context)
+        return context.mode == 'OBJECT'
 
+    @instrumented
     def execute(self, context):
-        # Get the scene and the active named selection
-        scene = context.scene
-        named_selection = scene.named_selections[scene.named_selections_index]
+        view_layer = context.view_layer
+        wm = context.window_manager
+        current, added = capture_selection(view_layer, wm)
+        # The list the index was picked from did not show the snapshot just added; the
+        # shortcut leaves the index unset and always means the previous selection
+        picked = self.properties.is_property_set("index")
+        index = self.index + 1 if added and picked and self.index > 0 else self.index
+
+        history = get_selection_history(view_layer)
+        if index >= len(history):
+            self.report({'WARNING'}, "No such selection in the history")
+            return {'CANCELLED'}
 
-        # Check if we should append to the current selection
-        if not self.append:
-            # Deselect all objects if not appending
-            bpy.ops.object.select_all(action='DESELECT')
+        target = history.get(index)
+        selected, deselected = apply_selection_bitset(view_layer, current, target)
+        history.push(target, bin(target).count("1"), wm.named_selection_history_size,
+                     wm.named_selection_history_memory * 1024)
+        self.report({'INFO'}, f"Selection restored: {selected} selected, {deselected} deselected")
+        return {'FINISHED'}
 
 
-       # Select the objects in the named selection
-        for obj in named_selection.objects:
-            object = bpy.data.objects.get(obj.name)
-            if object:
-                object.select_set(True)
-                
-       # Make sure the active object is set to one of the selected objects
-        if named_selection.objects and not self.append:
-            bpy.context.view_layer.objects.active = bpy.data.objects[named_selection.objects[0].name]
+# A custom operator that clears the selection history
+class ClearSelectionHistory(Operator):
+    bl_idname = "object.clear_selection_history"
+    bl_label = "Clear History"
+    bl_description = "Forget the recent selections of this view layer"
 
+    @instrumented
+    def execute(self, context):
+        _selection_histories.pop(context.view_layer.as_pointer(), None)
         return {'FINISHED'}
-# A custom operator that removes a named selection
-class RemoveNamedSelection(Operator):
-    """Operator to remove an existing named selection.
 
-    Removes a named selection from the scene. This action does not delete the objects,
-    only the grouping reference.
-    """
-    
-    bl_idname = "object.remove_named_selection"
-    bl_label = "Remove Named Selection"
-    bl_description = "Remove the named selection"
-    bl_options = {'REGISTER', 'UNDO'}
 
-    def execute(self, context):
-        scene = context.scene
+# The interchange file is JSON Lines: a header line, then a line per named selection
+# followed by the names of its objects in lines of up to INTERCHANGE_CHUNK_SIZE names
+INTERCHANGE_FORMAT = "named-selections"
+INTERCHANGE_VERSION = 1
+INTERCHANGE_CHUNK_SIZE = 1000
 
-        # Get the index of the currently active named selection
-        active_idx = scene.named_selections_index
+# How imported named selections are combined with the existing ones
+IMPORT_MODES = [
+    ('MERGE', "Merge", "Keep the existing named selections and give imported ones with a taken name a unique name"),
+    ('UPDATE', "Update", "Add the imported objects to the existing named selections of the same name"),
+    ('REPLACE', "Replace", "Remove all existing named selections before importing"),
+]
 
-        # Check if the index is valid
-        if active_idx < 0 or active_idx >= len(scene.named_selections):
-            self.report({'WARNING'}, "No valid named selection selected")
-            return {'CANCELLED'}
 
-        # Remove the active named selection
-        scene.named_selections.remove(active_idx)
+def rule_to_record(rule):
+    return {
+        "rule_type": rule.rule_type,
+        "pattern": rule.pattern,
+        "value": rule.value,
+        "object_type": rule.object_type,
+        "collection": rule.collection.name if rule.collection is not None else None,
+        "material": rule.material.name if rule.material is not None else None,
+        "negate": rule.negate,
+    }
 
-        # Update the active index to a valid value
-        if active_idx >= len(scene.named_selections):
-            scene.named_selections_index = len(scene.named_selections) - 1
-        else:
-            scene.named_selections_index = active_idx
 
-        # Force a UI refresh
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
+def rule_from_record(rule, record):
+    rule.rule_type = record.get("rule_type", 'NAME')
+    rule.pattern = record.get("pattern", "")
+    rule.value = record.get("value", "")
+    rule.object_type = record.get("object_type", 'MESH')
+    rule.collection = bpy.data.collections.get(record.get("collection") or "")
+    rule.material = bpy.data.materials.get(record.get("material") or "")
+    rule.negate = record.get("negate", False)
 
-        return {'FINISHED'}
 
-# A custom operator that removes an object from a named selection
-class RemoveObjectFromNamedSelection(Operator):
+def iter_interchange_records(scene, chunk_size=INTERCHANGE_CHUNK_SIZE):
+    """Yield the records of the interchange file of a scene's named selections, one per line."""
+    yield {"format": INTERCHANGE_FORMAT, "version": INTERCHANGE_VERSION, "addon_version": CURRENT_VERSION}
+
+    for named_selection in scene.named_selections:
+        yield {
+            "selection": named_selection.name,
+            "element_type": named_selection.element_type,
+            "use_rules": named_selection.use_rules,
+            "match_all": named_selection.match_all,
+            "rules": [rule_to_record(rule) for rule in named_selection.rules],
+        }
+        # Element named selections also carry the packed element mask of each object
+        if named_selection.element_type != 'OBJECT':
+            members = [member for member in named_selection.objects if member.object is not None]
+            for start in range(0, len(members), chunk_size):
+                chunk = members[start:start + chunk_size]
+                yield {
+                    "objects": [member.object.name for member in chunk],
+                    "elements": [[member.element_count, member.elements] for member in chunk],
+                }
+            continue
+
+        names = [obj.name for obj in get_stored_objects(named_selection) if obj is not None]
+        for start in range(0, len(names), chunk_size):
+            yield {"objects": names[start:start + chunk_size]}
+
+
+def export_named_selections(scene, filepath, chunk_size=INTERCHANGE_CHUNK_SIZE):
+    """Write the named selections of a scene to an interchange file.
+
+    Returns:
+        tuple: The number of named selections and members written.
     """
-    Operator to remove the active object from a named selection.
+    selections = members = 0
+    with open(filepath, "w", encoding="utf-8") as interchange_file:
+        for record in iter_interchange_records(scene, chunk_size):
+            if "selection" in record:
+                selections += 1
+            members += len(record.get("objects", ()))
+            interchange_file.write(json.dumps(record, separators=(",", ":")))
+            interchange_file.write("\n")
+    return selections, members
+
+
+def read_interchange_records(filepath):
+    """Yield the records of an interchange file one line at a time, after checking its header.
+
+    Raises:
+        ValueError: If the file is not a named selections file of a supported version.
+    """
+    with open(filepath, encoding="utf-8") as interchange_file:
+        try:
+            header = json.loads(interchange_file.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != INTERCHANGE_FORMAT:
+            raise ValueError("Not a named selections file")
+        if header.get("version", 0) > INTERCHANGE_VERSION:
+            raise ValueError(f"Named selections file version {header['version']} is not supported")
 
-    This operator allows users to remove the currently active object from a specified named selection.
-    It modifies the named selection to exclude the active object, updating the collection of objects
-    within that selection. The operation is registered for undo/redo capabilities in Blender.
+        for line in interchange_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def import_named_selections(scene, filepath, mode='MERGE'):
+    """Read named selections from an interchange file into a scene.
+
+    The file is read line by line and the objects are added in batches of one line,
+    so large files are never held in memory at once. Object names are resolved
+    against the objects of the scene, and names without an object are skipped.
 
+    Returns:
+        tuple: The number of named selections read, members added and object names not found.
     """
-    bl_idname = "object.remove_object_from_named_selection"
-    bl_label = "Remove Object From Named Selection"
-    bl_description = "Remove the active object from the named selection"
-    bl_options = {'REGISTER', 'UNDO'}
+    if mode == 'REPLACE':
+        for named_selection in scene.named_selections:
+            release_storage_collection(named_selection)
+        invalidate_membership_indices()
+        invalidate_reverse_indices()
+        mark_named_selections_changed()
+        scene.named_selections.clear()
+
+    allocator = UniqueNameAllocator(ns.name for ns in scene.named_selections)
+    objects_by_name = None
+    named_selection = None
+    selections = members = missing = 0
+
+    for record in read_interchange_records(filepath):
+        if "selection" in record:
+            element_type = record.get("element_type", 'OBJECT')
+            named_selection = scene.named_selections.get(record["selection"]) if mode == 'UPDATE' else None
+            if named_selection is None:
+                named_selection = new_named_selection(scene, allocator.allocate(record["selection"]))
+                named_selection.element_type = element_type
+                named_selection.use_rules = record.get("use_rules", False)
+                named_selection.match_all = record.get("match_all", True)
+                for rule_record in record.get("rules", ()):
+                    rule_from_record(named_selection.rules.add(), rule_record)
+            selections += 1
+
+        elif "objects" in record:
+            if named_selection is None:
+                raise ValueError("Object names before the first named selection")
+            # Built on first use, so a file without objects costs no pass over the scene
+            if objects_by_name is None:
+                objects_by_name = {obj.name: obj for obj in scene.objects}
+            found = [objects_by_name[name] for name in record["objects"] if name in objects_by_name]
+            missing += len(record["objects"]) - len(found)
+            members += add_members(named_selection, found)
+
+            # Element masks are skipped when the selection being updated holds other elements
+            if "elements" in record and element_type != 'OBJECT' and named_selection.element_type == element_type:
+                for name, (element_count, elements) in zip(record["objects"], record["elements"]):
+                    if name in objects_by_name:
+                        member = get_member(named_selection, objects_by_name[name])
+                        member.element_count = element_count
+                        member.elements = elements
+
+    return selections, members, missing
+
+
+# A custom operator that writes the named selections to an interchange file
+class ExportNamedSelections(Operator, ExportHelper):
+    """Operator to export the named selections of the scene.
+
+    Writes every named selection, its rules and the names of its objects to a
+    JSON Lines file that can be imported into other scenes and files.
+    """
+
+    bl_idname = "export_scene.named_selections"
+    bl_label = "Export Named Selections"
+    bl_description = "Save the named selections of the scene to a file"
+
+    filename_ext = ".jsonl"
+    filter_glob: StringProperty(default="*.jsonl", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.named_selections
 
+    @instrumented
     def execute(self, context):
-        # Get the scene, the active object and the active named selection
-        scene = context.scene
-        named_selection_index = scene.named_selections_index
-        
-        
-        named_selection = scene.named_selections[named_selection_index]
-        
-         # Iterate over all selected objects and add them if they are not already in the named selection
-        for obj in context.selected_objects:
-            if obj.name in [o.name for o in named_selection.objects]:
-                 # Find the index of the object in the named selection's custom property
-                index = named_selection.objects.find(obj.name)
-                # Remove the object from the named selection's custom property
-                named_selection.objects.remove(index)      
+        try:
+            selections, members = export_named_selections(context.scene, self.filepath)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not export named selections: {e}")
+            return {'CANCELLED'}
 
+        self.report({'INFO'}, f"Exported {selections} named selections with {members} objects")
         return {'FINISHED'}
 
-# A custom operator that adds an object to a named selection
-class AddObjectToNamedSelection(Operator):
-    bl_idname = "object.add_object_to_named_selection"
-    bl_label = "Add Object To Named Selection"
-    bl_description = "Add the active object to the named selection"
+
+# A custom operator that reads named selections from an interchange file
+class ImportNamedSelections(Operator, ImportHelper):
+    """Operator to import named selections into the scene.
+
+    Reads a file written by the export operator and adds its named selections to
+    the scene, merged with, added to or replacing the existing ones.
+    """
+
+    bl_idname = "import_scene.named_selections"
+    bl_label = "Import Named Selections"
+    bl_description = "Load named selections from a file into the scene"
     bl_options = {'REGISTER', 'UNDO'}
 
+    filename_ext = ".jsonl"
+    filter_glob: StringProperty(default="*.jsonl", options={'HIDDEN'})
+    mode: EnumProperty(name="Mode", items=IMPORT_MODES, default='MERGE')
+
+    @instrumented
     def execute(self, context):
         scene = context.scene
-        named_selection_index = scene.named_selections_index
+        start = time.perf_counter()
 
-        # Ensure there is a valid named selection
-        if named_selection_index >= len(scene.named_selections):
-            self.report({'WARNING'}, "No named selection selected")
+        try:
+            selections, members, missing = import_named_selections(scene, self.filepath, self.mode)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.report({'ERROR'}, f"Could not import named selections: {e}")
             return {'CANCELLED'}
 
-        named_selection = scene.named_selections[named_selection_index]
+        scene.named_selections_index = min(max(scene.named_selections_index, 0), len(scene.named_selections) - 1)
+        tag_view3d_redraw(context)
 
-        # Iterate over all selected objects and add them if they are not already in the named selection
-        for obj in context.selected_objects:
-            if obj.name not in [o.name for o in named_selection.objects]:
-                named_selection.objects.add().name = obj.name
+        elapsed = (time.perf_counter() - start) * 1000.0
+        message = f"Imported {selections} named selections with {members} objects in {elapsed:.1f} ms"
+        if missing:
+            message += f", {missing} objects not found"
+        self.report({'WARNING'} if missing else {'INFO'}, message)
 
         return {'FINISHED'}
 
 
-class ClearNamedSelection(Operator):
-    bl_idname = "object.clear_named_selection"
-    bl_label = "Clear Named Selection"
-    bl_description = "Clear all objects from the named selection"
-    bl_options = {'REGISTER', 'UNDO'}
+def menu_func_export(self, context):
+    self.layout.operator(ExportNamedSelections.bl_idname, text="Named Selections (.jsonl)")
 
-    def execute(self, context):
-        scene = context.scene
-        named_selection_index = scene.named_selections_index
 
-        # Ensure there is a valid named selection
-        if named_selection_index >= len(scene.named_selections):
-            self.report({'WARNING'}, "No named selection selected")
-            return {'CANCELLED'}
+def menu_func_import(self, context):
+    self.layout.operator(ImportNamedSelections.bl_idname, text="Named Selections (.jsonl)")
 
-        named_selection = scene.named_selections[named_selection_index]
-        
-        # Clear all objects from the named selection
-        named_selection.objects.clear()
 
-        return {'FINISHED'}
-    
-class RenameNamedSelection(Operator):
-    bl_idname = "object.rename_named_selection"
-    bl_label = "Rename Named Selection"
-    bl_description = "Rename the selected named selection"
-    bl_options = {'REGISTER', 'UNDO'}
+# The member counts of each scene's named selections, by scene address, with the revision
+# they were counted at
+_member_counts = {}
 
-    new_name: bpy.props.StringProperty(name="New Name")
 
-    def execute(self, context):
-        scene = context.scene
-        named_selection_index = scene.named_selections_index
+def get_member_counts(scene):
+    """Return the member count of every named selection of a scene, in list order."""
+    key = (get_revision(), len(scene.named_selections))
+    cached = _member_counts.get(scene.as_pointer())
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
-        # Ensure there is a valid named selection
-        if named_selection_index >= len(scene.named_selections):
-            self.report({'WARNING'}, "No named selection selected")
-            return {'CANCELLED'}
+    counts = [get_member_count(named_selection) for named_selection in scene.named_selections]
+    _member_counts[scene.as_pointer()] = (key, counts)
+    return counts
 
-        # Rename the named selection
-        named_selection = scene.named_selections[named_selection_index]
-        named_selection.name = self.new_name
-        
-         # Force a UI refresh
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
 
+# The last filter results of each list, by the address of the data they were computed for
+_list_filters = {}
 
-        return {'FINISHED'}
 
-    def invoke(self, context, event):
-        named_selection_index = context.scene.named_selections_index
-        if named_selection_index < len(context.scene.named_selections):
-            self.new_name = context.scene.named_selections[named_selection_index].name
-        return context.window_manager.invoke_props_dialog(self)
+class NamedSelectionsList(UIList):
+    """UI List showing the named selections of a scene with their member counts.
+
+    Filtering by name and sorting by name or member count are done in one pass over
+    the named selections, and the result is cached until the named selections or the
+    filter settings change, so redraws of long lists stay cheap.
+    """
+
+    bl_idname = "OBJECT_UL_named_selections"
+
+    sort_by_count: bpy.props.BoolProperty(
+        name="Sort by Member Count",
+        description="Sort the named selections by the number of objects they contain",
+        default=False
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        counts = get_member_counts(data)
+        row = layout.row(align=True)
+        if item.element_type != 'OBJECT':
+            row.prop(item, "name", text="", emboss=False, icon=ELEMENT_TYPE_ICONS[item.element_type])
+        else:
+            row.prop(item, "name", text="", emboss=False, icon_value=icon)
+        row.label(text=str(counts[index]) if index < len(counts) else "")
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+
+        row = layout.row(align=True)
+        row.label(text="Sort By:")
+        row.prop(self, "use_filter_sort_alpha", text="", icon='SORTALPHA')
+        row.prop(self, "sort_by_count", text="", icon='SORTSIZE')
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        key = (
+            get_revision(),
+            len(items),
+            self.filter_name,
+            self.use_filter_sort_alpha,
+            self.sort_by_count,
+            self.bitflag_filter_item,
+        )
+        cache_key = (data.as_pointer(), propname)
+        cached = _list_filters.get(cache_key)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Inverting and reversing are applied by Blender on top of these results
+        helpers = bpy.types.UI_UL_list
+        flags = helpers.filter_items_by_name(self.filter_name, self.bitflag_filter_item, items, "name")
+
+        if self.sort_by_count:
+            counts = get_member_counts(data)
+            ranked = sorted(range(len(items)), key=counts.__getitem__, reverse=True)
+            order = [0] * len(items)
+            for position, index in enumerate(ranked):
+                order[index] = position
+        elif self.use_filter_sort_alpha:
+            order = helpers.sort_items_by_name(items, "name")
+        else:
+            order = []
+
+        result = (flags, order)
+        _list_filters[cache_key] = (key, result)
+        return result
+
+
+class PanelState:
+    """Everything NamedSelectionsPanel needs to draw, computed once per change.
+
+    The state is keyed by the named selection revision and the few bits of context
+    the buttons depend on, so a redraw never has to look inside a named selection.
+
+    Attributes:
+        selection_count (int): The number of named selections in the scene.
+        has_active_selection (bool): Whether the active index points at a named selection.
+        member_count (int): The number of members of the active named selection.
+        active_is_member (bool): Whether the active object is in the active named selection.
+        active_containers (tuple): The names of all named selections that contain the active object.
+        can_remove, can_select, can_add_objects, can_remove_objects, can_clear, can_rename, can_combine, can_act (bool):
+            The enabled state of the panel buttons.
+    """
+
+    __slots__ = ("selection_count", "has_active_selection", "member_count", "active_is_member", "active_containers",
+                 "can_remove", "can_select", "can_add_objects", "can_remove_objects", "can_clear", "can_rename", "can_combine",
+                 "can_act")
+
+    def __init__(self, scene, active_object, active_selected, mode):
+        named_selections = scene.named_selections
+        self.selection_count = len(named_selections)
+
+        named_selection = None
+        if 0 <= scene.named_selections_index < self.selection_count:
+            named_selection = named_selections[scene.named_selections_index]
+
+        self.has_active_selection = named_selection is not None
+        self.member_count = get_member_count(named_selection) if named_selection else 0
+        self.active_is_member = bool(named_selection and active_object and contains_member(named_selection, active_object))
+        self.active_containers = tuple(
+            ns.name for ns in get_containing_selections(scene, active_object)) if active_object else ()
+
+        has_selections = self.selection_count > 0
+        self.can_remove = has_selections
+        # Element named selections can also be selected from mesh edit mode
+        self.can_select = has_selections and (mode == 'OBJECT' or (
+            mode == 'EDIT_MESH' and named_selection is not None and named_selection.element_type != 'OBJECT'))
+        self.can_add_objects = has_selections and active_selected
+        self.can_remove_objects = active_selected and self.active_is_member
+        self.can_clear = has_selections
+        self.can_rename = has_selections
+        self.can_combine = has_selections
+        self.can_act = mode == 'OBJECT' and self.member_count > 0
+
+
+# The last panel state of each scene, by scene address, with the key it was computed for
+_panel_states = {}
+
+
+def get_panel_state(context):
+    """Return the panel state for a context, recomputing it only when something changed."""
+    scene = context.scene
+    active_object = context.active_object
+    active_selected = bool(active_object and active_object.select_get())
+    mode = context.mode
+
+    key = (
+        get_revision(),
+        len(scene.named_selections),
+        scene.named_selections_index,
+        active_object.as_pointer() if active_object else 0,
+        active_selected,
+        mode,
+    )
+    cached = _panel_states.get(scene.as_pointer())
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    state = PanelState(scene, active_object, active_selected, mode)
+    _panel_states[scene.as_pointer()] = (key, state)
+    return state
 
 
 class NamedSelectionsPanel(Panel):
@@ -395,6 +3245,7 @@ class NamedSelectionsPanel(Panel):
     bl_region_type = "UI"
     bl_category = "View"
 
+    @instrumented
     def draw(self, context):
         layout = self.layout
         wm = context.window_manager
@@ -426,8 +3277,12 @@ class NamedSelectionsPanel(Panel):
             if tutorial_url and tutorial_url != "https://www.youtube.com/":
                 expand_col.operator("wm.url_open", text="Tutorials", icon='FILE_MOVIE').url = tutorial_url
         
-        # Check if the current mode is Object Mode
-        is_object_mode = context.mode == 'OBJECT'
+        # Named selections saved for a newer version are kept, but not cleaned up
+        if not is_scene_layout_supported(scene):
+            layout.label(text="Saved with a newer version of the add-on", icon='ERROR')
+
+        # The enabled states of the buttons are cached until something changes
+        state = get_panel_state(context)
 
         row = layout.row(align=True)
 
@@ -437,100 +3292,473 @@ class NamedSelectionsPanel(Panel):
        
         # Remove column
         remove_col = row.column(align=True)
-        remove_col.enabled = len(scene.named_selections) > 0
+        remove_col.enabled = state.can_remove
         remove_col.operator("object.remove_named_selection", text="Remove", icon='REMOVE')
 
         # Draw the listbox for showing the named selections
-        layout.template_list("UI_UL_list", "named_selections", scene, "named_selections", scene, "named_selections_index")
+        layout.template_list("OBJECT_UL_named_selections", "named_selections", scene, "named_selections", scene, "named_selections_index")
 
         # Separate row for Select button with conditional enabling
         select_row = layout.row(align=True)
         select_row.scale_y = 1.5  # Increase the height of the button
-        select_row.enabled = len(scene.named_selections) > 0 and is_object_mode
-        select_row.operator("object.select_named_selection", text="Select Objects", icon='OBJECT_DATAMODE')        
-      
+        select_row.enabled = state.can_select
+        select_row.operator("object.select_named_selection", text=f"Select Objects ({state.member_count})", icon='OBJECT_DATAMODE')
  
         # Column for adding an object from a named selection with conditional enabling
         add_object_row = layout.row(align=True)
-        active_object = context.active_object
-        # Check if there is an active object and if it is selected
-        add_object_row.enabled = len(scene.named_selections) > 0 and active_object and active_object.select_get()
+        add_object_row.enabled = state.can_add_objects
         add_object_row.operator("object.add_object_to_named_selection", text="Add Objects", icon='ADD')
 
-        # Column for removing an object from a named selection with conditional enabling
+        # Column for removing an object from a named selection, enabled when the
+        # active object is selected and part of the current named selection
         remove_object_row = layout.row(align=True)
-        named_selection_index = scene.named_selections_index
-        active_object = context.active_object       
-
-        # Check if the active object is selected and part of the current named selection
-        if (named_selection_index < len(scene.named_selections) and
-            active_object and active_object.select_get()):
-            named_selection = scene.named_selections[named_selection_index]
-            remove_object_row.enabled = active_object.name in [obj.name for obj in named_selection.objects]
-        else:
-            remove_object_row.enabled = False
-
+        remove_object_row.enabled = state.can_remove_objects
         remove_object_row.operator("object.remove_object_from_named_selection", text="Remove Objects", icon='CANCEL')
         
         # Row for the Clear Named Selection button with conditional enabling
         clear_row = layout.row(align=True)
-        clear_row.enabled = len(scene.named_selections) > 0 #and len(scene.named_selections[scene.named_selections_index].objects) > 0)
+        clear_row.enabled = state.can_clear
         clear_row.operator("object.clear_named_selection", text="Remove All Objects", icon='X')
          
          # Row for Rename button with conditional enabling
         rename_row = layout.row(align=True)
-        rename_row.enabled = len(scene.named_selections) > 0
+        rename_row.enabled = state.can_rename
         rename_row.operator("object.rename_named_selection", text="Rename", icon='TOOL_SETTINGS')
+
+        # Row for combining named selections with set operations
+        combine_row = layout.row(align=True)
+        combine_row.enabled = state.can_combine
+        combine_row.operator("object.combine_named_selections", text="Combine", icon='SELECT_INTERSECT')
+
+        # Row for generating named selections from the scene structure
+        layout.operator("object.generate_named_selections", text="Generate", icon='OUTLINER_COLLECTION')
+
+        # Menu of actions applied to all objects of the active named selection
+        action_row = layout.row(align=True)
+        action_row.enabled = state.can_act
+        action_row.operator_menu_enum("object.named_selection_bulk_action", "action", text="Actions", icon='MODIFIER')
+
+        # The named selections the active object belongs to
+        if context.active_object is not None:
+            self.draw_containers(context, layout.box(), state)
+
+        # Collapsible section of the recent selections
+        self.draw_history(context, layout.box())
+
+        # Collapsible rules section of the active named selection
+        if state.has_active_selection:
+            self.draw_rules(context, layout.box())
+
+        # Collapsible statistics section
+        self.draw_stats(context, layout.box())
+
+    def draw_rules(self, context, box):
+        scene = context.scene
+        named_selection = scene.named_selections[scene.named_selections_index]
+
+        row = box.row()
+        row.prop(scene, "show_named_selection_rules", icon="TRIA_DOWN" if scene.show_named_selection_rules else "TRIA_RIGHT", emboss=False)
+        if not scene.show_named_selection_rules:
+            return
+
+        row = box.row(align=True)
+        row.prop(named_selection, "use_rules")
+        row.prop(named_selection, "match_all")
+
+        rules_col = box.column(align=True)
+        rules_col.enabled = named_selection.use_rules
+        for index, rule in enumerate(named_selection.rules):
+            row = rules_col.row(align=True)
+            row.prop(rule, "rule_type", text="")
+            if rule.rule_type in {'NAME', 'REGEX'}:
+                row.prop(rule, "pattern", text="")
+            elif rule.rule_type == 'TYPE':
+                row.prop(rule, "object_type", text="")
+            elif rule.rule_type == 'COLLECTION':
+                row.prop(rule, "collection", text="")
+            elif rule.rule_type == 'PROPERTY':
+                row.prop(rule, "pattern", text="", icon='PROPERTIES')
+                row.prop(rule, "value", text="")
+            elif rule.rule_type == 'MATERIAL':
+                row.prop(rule, "material", text="")
+            row.prop(rule, "negate", text="", icon='CANCEL')
+            row.operator("object.remove_named_selection_rule", text="", icon='X').index = index
+
+        box.operator("object.add_named_selection_rule", text="Add Rule", icon='ADD')
+
+    def draw_containers(self, context, box, state):
+        box.label(text=f"{context.active_object.name} is in {len(state.active_containers)} named selections:", icon='OBJECT_DATA')
+        if state.active_containers:
+            names_col = box.column(align=True)
+            for name in state.active_containers:
+                names_col.label(text=name, icon='DOT')
+
+        row = box.row(align=True)
+        row.enabled = bool(state.active_containers)
+        row.operator("object.select_containing_named_selections", text="Select All", icon='RESTRICT_SELECT_OFF')
+        row.operator("object.remove_from_all_named_selections", text="Remove From All", icon='X')
+
+    def draw_history(self, context, box):
+        scene = context.scene
+        wm = context.window_manager
+
+        row = box.row()
+        row.prop(scene, "show_named_selection_history", icon="TRIA_DOWN" if scene.show_named_selection_history else "TRIA_RIGHT", emboss=False)
+        if not scene.show_named_selection_history:
+            return
+
+        history = get_selection_history(context.view_layer)
+        now = time.time()
+        col = box.column(align=True)
+        for index, (count, captured) in enumerate(history.describe()):
+            row = col.row(align=True)
+            row.label(text=f"{count} objects, {now - captured:.0f} s ago" if index else f"{count} objects (newest)")
+            restore = row.operator("object.restore_selection_snapshot", text="", icon='RESTRICT_SELECT_OFF')
+            restore.index = index
+            promote = row.operator("object.add_named_selection", text="", icon='ADD')
+            promote.snapshot = index
+
+        settings = box.row(align=True)
+        settings.prop(wm, "named_selection_history_size", text="Size")
+        settings.prop(wm, "named_selection_history_memory", text="KiB")
+        box.label(text=f"{len(history)} selections in {history.size / 1024.0:.1f} KiB")
+        box.operator("object.clear_selection_history", icon='X')
+
+    def draw_stats(self, context, box):
+        scene = context.scene
+        wm = context.window_manager
+
+        row = box.row()
+        row.prop(scene, "show_named_selection_stats", icon="TRIA_DOWN" if scene.show_named_selection_stats else "TRIA_RIGHT", emboss=False)
+        if not scene.show_named_selection_stats:
+            return
+
+        box.prop(wm, "named_selection_instrumentation")
+
+        stats_col = box.column(align=True)
+        for name, stats in sorted(get_hot_path_stats().items()):
+            stats_col.label(text=name)
+            stats_col.label(text=f"    {stats.calls} calls, p50 {stats.percentile(0.5) * 1000.0:.2f} ms, "
+                                 f"p95 {stats.percentile(0.95) * 1000.0:.2f} ms, max {stats.max * 1000.0:.2f} ms, "
+                                 f"{stats.members} members")
+        for name, count in sorted(get_event_counters().items()):
+            stats_col.label(text=f"{name}: {count}")
+
+        row = box.row(align=True)
+        row.operator("wm.reset_named_selection_stats", icon='X')
+        row.operator("wm.dump_named_selection_stats", icon='EXPORT')
+        box.operator("wm.report_named_selection_storage", icon='DISK_DRIVE')
         
 
 
-# A handler function that updates the named selections when an object is deleted
-def update_named_selections(scene):
-    # Loop through all named selections in the scene
+# Seconds without structural depsgraph updates before the pending reconciliation pass runs,
+# so bursts of edits such as pasting or duplicating many objects are handled in one pass
+RECONCILE_DEBOUNCE_INTERVAL = 0.25
+
+# Number of entries in bpy.data.objects seen by the last depsgraph update. Adding or deleting
+# objects usually changes it, so ticks that only move or edit existing objects can be skipped.
+# "deadline" is the monotonic time at which the pending reconciliation pass may run.
+_prune_state = {"object_count": None, "deadline": 0.0}
+
+
+def has_structural_updates(depsgraph):
+    """Check whether a depsgraph update may have added, removed or relinked objects.
+
+    Transform, geometry and shading updates, such as the ones sent on every frame of
+    a transform drag, are not structural. Without a depsgraph the answer is always yes.
+    """
+    if depsgraph is None:
+        return True
+
+    for update in depsgraph.updates:
+        id_data = update.id
+        # Linking and unlinking objects tags the collections they live in
+        if isinstance(id_data, bpy.types.Collection):
+            return True
+        # Renames and relinks tag the object without any of the data flags
+        if isinstance(id_data, bpy.types.Object) and not (
+                update.is_updated_transform or update.is_updated_geometry or update.is_updated_shading):
+            return True
+    return False
+
+
+def has_rule_relevant_updates(depsgraph):
+    """Check whether a depsgraph update may change the objects matched by named selection rules.
+
+    Rules match on names, types, collections, custom properties and materials, so only
+    transform and geometry updates can safely be ignored. Without a depsgraph the
+    answer is always yes.
+    """
+    if depsgraph is None:
+        return True
+
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, (bpy.types.Collection, bpy.types.Material)):
+            return True
+        if isinstance(id_data, bpy.types.Object) and (
+                update.is_updated_shading or not (update.is_updated_transform or update.is_updated_geometry)):
+            return True
+    return False
+
+
+def has_selection_updates(depsgraph):
+    """Check whether a depsgraph update may come from a change of the object selection.
+
+    Selecting objects tags the scene without tagging the objects. Without a depsgraph
+    the answer is always yes.
+    """
+    if depsgraph is None:
+        return True
+
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Scene):
+            return True
+    return False
+
+
+def get_scene_objects():
+    """Return the set of objects that are linked into any scene."""
+    linked = set()
+    for scene in bpy.data.scenes:
+        linked.update(scene.objects)
+    return linked
+
+
+def prune_named_selections(scene, linked=None):
+    """Remove members whose objects were deleted from all named selections of a scene.
+
+    A member is dangling when its object is gone or no longer linked into any scene;
+    the reference held by the member keeps deleted objects alive as orphan data until
+    it is pruned. Every selection is checked against a single snapshot of the linked
+    objects, and the dangling members of each selection are removed in one batch.
+
+    Args:
+        scene (Scene): The scene whose named selections are pruned.
+        linked (set): The objects linked into any scene, from get_scene_objects.
+            Taken when not given.
+
+    Scenes marked for a newer add-on version are skipped, since their members may be
+    stored in a way this version cannot read.
+
+    Returns:
+        int: The number of members that were removed.
+    """
+    if not is_scene_layout_supported(scene):
+        return 0
+    if linked is None:
+        linked = get_scene_objects()
+    removed = 0
+
     for named_selection in scene.named_selections:
-        # Loop through all objects in the named selection
-        for obj in named_selection.objects:
-            # Check if the object still exists
-            if not bpy.data.objects.get(obj.name):
-                # Find the index of the object in the named selection's custom property
-                index = named_selection.objects.find(obj.name)
+        note_members_touched(get_stored_count(named_selection))
+        if uses_compact_storage(named_selection):
+            removed += remove_members(named_selection, [
+                obj for obj in get_stored_objects(named_selection) if obj not in linked])
+            continue
+
+        dangling = [slot for slot, member in enumerate(named_selection.objects) if member.object not in linked]
+        if dangling:
+            remove_member_slots(named_selection, reversed(dangling))
+            removed += len(dangling)
+
+    return removed
+
+
+@instrumented
+def reconcile_named_selections(scenes, linked=None):
+    """Prune the named selections of several scenes against one snapshot of the linked objects.
+
+    Unlike the depsgraph handler, which only hears about the scene that was updated,
+    this also cleans up the named selections of all other scenes.
+
+    Returns:
+        int: The number of members that were removed.
+    """
+    if linked is None:
+        linked = get_scene_objects()
+
+    removed = 0
+    scanned = 0
+    for scene in scenes:
+        removed += prune_named_selections(scene, linked)
+        scanned += 1
+
+    count_event("reconcile passes")
+    count_event("scenes scanned", scanned)
+    count_event("members pruned", removed)
+    return removed
+
+
+# A timer function that runs the pending reconciliation pass once the depsgraph updates settle
+def process_pending_reconciliation():
+    remaining = _prune_state["deadline"] - time.monotonic()
+    if remaining > 0.0:
+        return remaining
 
-                # Remove the object from the named selection's custom property
-                named_selection.objects.remove(index)
+    _prune_state["object_count"] = len(bpy.data.objects)
+    reconcile_named_selections(bpy.data.scenes)
+    return None
+
+
+def schedule_reconciliation(delay=RECONCILE_DEBOUNCE_INTERVAL):
+    """Run a reconciliation pass over all scenes after delay seconds without further requests.
+
+    Requests made while a pass is pending move its deadline instead of adding a pass.
+    """
+    _prune_state["deadline"] = time.monotonic() + delay
+    if bpy.app.timers.is_registered(process_pending_reconciliation):
+        count_event("updates coalesced")
+        return
+    bpy.app.timers.register(process_pending_reconciliation, first_interval=delay)
+
+
+# A handler function that schedules a reconciliation pass when objects may have been deleted
+@persistent
+@instrumented
+def update_named_selections(scene, depsgraph=None):
+    object_count = len(bpy.data.objects)
+
+    if has_selection_updates(depsgraph):
+        schedule_selection_capture()
+
+    # Cached rule results stay valid until something they match on changes
+    if object_count != _prune_state["object_count"] or has_rule_relevant_updates(depsgraph):
+        mark_scene_content_changed()
+
+    # Only rescan when objects may have been added, removed or renamed since the last pass
+    if object_count == _prune_state["object_count"] and not has_structural_updates(depsgraph):
+        return
+
+    # Blender unlinks deleted objects from the storage collections by itself, so the
+    # cached contents are stale right away, before the pass runs
+    if _prune_state["object_count"] is not None and object_count < _prune_state["object_count"]:
+        invalidate_reverse_indices()
+        mark_named_selections_changed()
+
+    _prune_state["object_count"] = object_count
+    schedule_reconciliation()
+
+
+# A handler function that forces a full reconciliation pass after a file load, undo or redo
+@persistent
+def reset_named_selection_state(*args):
+    _prune_state["object_count"] = None
+    invalidate_membership_indices()
+    mark_named_selections_changed()
+    _panel_states.clear()
+    _member_counts.clear()
+    _list_filters.clear()
+    _rule_results.clear()
+    invalidate_reverse_indices()
+    # Snapshots are bitsets over the object indices
+    reset_bitsets()
+    _selection_histories.clear()
+    # Deferred, so the pass sees the named selections after migration and runs outside
+    # of the undo system's own handlers
+    schedule_reconciliation(delay=0.0)
+
+
+# A handler function that converts named selections saved by older versions after a file load
+@persistent
+def migrate_named_selections_on_load(*args):
+    for scene in bpy.data.scenes:
+        migrate_named_selections(scene)
+
+# The classes of the addon, in registration order; property groups come before the types
+# that reference them
+classes = (
+    CheckForUpdateOperator,
+    NamedSelectionMember,
+    NamedSelectionRule,
+    NamedSelection,
+    AddNamedSelection,
+    SelectNamedSelection,
+    RemoveNamedSelection,
+    RemoveObjectFromNamedSelection,
+    AddObjectToNamedSelection,
+    ClearNamedSelection,
+    RenameNamedSelection,
+    AddNamedSelectionRule,
+    RemoveNamedSelectionRule,
+    ResetNamedSelectionStats,
+    DumpNamedSelectionStats,
+    ReportNamedSelectionStorage,
+    CombineNamedSelections,
+    SelectContainingNamedSelections,
+    RemoveFromAllNamedSelections,
+    NamedSelectionBulkAction,
+    GenerateNamedSelections,
+    RestoreSelectionSnapshot,
+    ClearSelectionHistory,
+    ExportNamedSelections,
+    ImportNamedSelections,
+    NamedSelectionsList,
+    NamedSelectionsPanel,
+)
+
+# The application handlers of the addon as (handler list name, function) pairs
+handlers = (
+    ("depsgraph_update_post", update_named_selections),
+    ("load_post", reset_named_selection_state),
+    ("undo_post", reset_named_selection_state),
+    ("redo_post", reset_named_selection_state),
+    ("load_post", migrate_named_selections_on_load),
+)
+
+# The menu entries of the addon as (menu name, draw function) pairs
+menus = (
+    ("TOPBAR_MT_file_export", menu_func_export),
+    ("TOPBAR_MT_file_import", menu_func_import),
+)
+
+# The keyboard shortcuts of the addon as (keymap name, operator, key, modifier keys) tuples
+shortcuts = (
+    ("Object Mode", "object.restore_selection_snapshot", 'F5', {}),
+)
+
+# The keymaps and keymap items added by register, to be removed by unregister
+_addon_keymaps = []
 
 # Register the custom property group, operators, panel and handler
 def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
     register_properties()
-    bpy.utils.register_class(CheckForUpdateOperator)
-    bpy.utils.register_class(NamedSelection)
-    bpy.utils.register_class(AddNamedSelection)
-    bpy.utils.register_class(SelectNamedSelection)
-    bpy.utils.register_class(RemoveNamedSelection)
-    bpy.utils.register_class(RemoveObjectFromNamedSelection)
-    bpy.utils.register_class(AddObjectToNamedSelection)
-    bpy.utils.register_class(ClearNamedSelection)    
-    bpy.utils.register_class(RenameNamedSelection)  
-    bpy.utils.register_class(NamedSelectionsPanel)
-    bpy.types.Scene.named_selections = CollectionProperty(type=NamedSelection)
-    bpy.types.Scene.named_selections_index = bpy.props.IntProperty()
-    bpy.app.handlers.depsgraph_update_post.append(update_named_selections)
+    for handler_list, function in handlers:
+        getattr(bpy.app.handlers, handler_list).append(function)
+    for menu, draw_function in menus:
+        getattr(bpy.types, menu).append(draw_function)
+    # There is no add-on key configuration in background mode
+    keyconfig = bpy.context.window_manager.keyconfigs.addon
+    if keyconfig is not None:
+        for keymap_name, idname, key, modifiers in shortcuts:
+            keymap = keyconfig.keymaps.new(name=keymap_name, space_type='EMPTY')
+            _addon_keymaps.append((keymap, keymap.keymap_items.new(idname, key, 'PRESS', **modifiers)))
+    # The file that is open while the add-on is enabled has no load event
+    bpy.app.timers.register(migrate_named_selections_on_load, first_interval=0.0)
 
 # Unregister the custom property group, operators, panel and handler
 def unregister():
+    if _update_checker["instance"] is not None:
+        _update_checker["instance"].cancel()
+        _update_checker["instance"] = None
+    if bpy.app.timers.is_registered(migrate_named_selections_on_load):
+        bpy.app.timers.unregister(migrate_named_selections_on_load)
+    if bpy.app.timers.is_registered(process_pending_reconciliation):
+        bpy.app.timers.unregister(process_pending_reconciliation)
+    if bpy.app.timers.is_registered(capture_pending_selection):
+        bpy.app.timers.unregister(capture_pending_selection)
+    for keymap, keymap_item in _addon_keymaps:
+        keymap.keymap_items.remove(keymap_item)
+    _addon_keymaps.clear()
+    for menu, draw_function in reversed(menus):
+        getattr(bpy.types, menu).remove(draw_function)
+    for handler_list, function in reversed(handlers):
+        getattr(bpy.app.handlers, handler_list).remove(function)
     unregister_properties()
-    bpy.utils.unregister_class(CheckForUpdateOperator)
-    bpy.utils.unregister_class(NamedSelection)
-    bpy.utils.unregister_class(AddNamedSelection)
-    bpy.utils.unregister_class(SelectNamedSelection)
-    bpy.utils.unregister_class(RemoveNamedSelection)
-    bpy.utils.unregister_class(RemoveObjectFromNamedSelection)
-    bpy.utils.unregister_class(AddObjectToNamedSelection)
-    bpy.utils.unregister_class(ClearNamedSelection)
-    bpy.utils.unregister_class(RenameNamedSelection)
-    bpy.utils.unregister_class(NamedSelectionsPanel)
-    del bpy.types.Scene.named_selections
-    del bpy.types.Scene.named_selections_index
-    bpy.app.handlers.depsgraph_update_post.remove(update_named_selections)
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
 
 # Run the register function
 if __name__ == "__main__":
@@ -0,0 +1,278 @@
+"""Apply a named selection job to many .blend files with a pool of background Blender processes.
+
+Run it with plain Python; it starts the Blender processes itself:
+
+    python batch/run_batch.py --blender /path/to/blender --workers 8 report shots/**/*.blend
+    python batch/run_batch.py prune --dry-run shots/*.blend
+    python batch/run_batch.py create --collection Trees --name "All Trees" shots/*.blend
+
+Each worker is one ``blender -b`` process that loads the add-on from this repository
+and works through a chunk of the files, so Blender starts once per chunk instead of
+once per file. The per-file results and timings of all workers are collected into a
+single JSON report. Files that a job changed are saved unless ``--dry-run`` is given.
+
+Jobs:
+    create  Add the objects of a collection (and its children) to a named selection,
+            creating it if needed.
+    prune   Remove members whose objects were deleted, with the same logic as the
+            add-on's depsgraph handler.
+    report  Count named selections, members, dangling members and rules.
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import glob
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+BATCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BATCH_DIR)
+JOBS = ("create", "prune", "report")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("job", choices=JOBS, help="the job to apply to every file")
+    parser.add_argument("files", nargs="+", help=".blend files or glob patterns")
+    parser.add_argument("--collection", help="create: the collection whose objects are added")
+    parser.add_argument("--name", help="create: the named selection to add to (default: the collection name)")
+    parser.add_argument("--dry-run", action="store_true", help="do not save the files a job changed")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="the Blender executable")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of Blender processes")
+    parser.add_argument("--files-per-process", type=int, default=20,
+                        help="number of files each Blender process works through")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds a Blender process may run")
+    parser.add_argument("--output", default="named_selections_batch.json", help="path of the JSON report")
+    # Only passed by the coordinator to the Blender processes
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.job == "create" and not args.collection:
+        parser.error("the create job needs --collection")
+    return args
+
+
+# --------------------------------------------------------------------------------------
+# Worker, inside Blender
+
+def job_create(bpy, addon, args):
+    collection = bpy.data.collections.get(args.collection)
+    if collection is None:
+        return {"changed": False, "error": f"no collection named {args.collection!r}"}
+
+    name = args.name or collection.name
+    scene = bpy.context.scene
+    named_selection = scene.named_selections.get(name)
+    created = named_selection is None
+    if created:
+        named_selection = addon.new_named_selection(scene, name)
+    added = addon.add_members(named_selection, collection.all_objects)
+    return {"changed": created or added > 0, "selection": name, "created": created, "members_added": added}
+
+
+def job_prune(bpy, addon, args):
+    removed = {scene.name: addon.prune_named_selections(scene) for scene in bpy.data.scenes}
+    return {"changed": any(removed.values()), "members_removed": sum(removed.values()), "scenes": removed}
+
+
+def job_report(bpy, addon, args):
+    linked = addon.get_scene_objects()
+    scenes = {}
+    for scene in bpy.data.scenes:
+        scenes[scene.name] = [{
+            "name": named_selection.name,
+            "members": addon.get_stored_count(named_selection),
+            "dangling": sum(1 for obj in addon.get_stored_objects(named_selection) if obj not in linked),
+            "rules": len(named_selection.rules),
+        } for named_selection in scene.named_selections]
+
+    selections = [entry for entries in scenes.values() for entry in entries]
+    return {
+        "changed": False,
+        "selections": len(selections),
+        "members": sum(entry["members"] for entry in selections),
+        "dangling": sum(entry["dangling"] for entry in selections),
+        "scenes": scenes,
+    }
+
+
+JOB_FUNCTIONS = {"create": job_create, "prune": job_prune, "report": job_report}
+
+
+def run_worker(bpy, args):
+    """Apply the job to each file in turn and write the results to args.result."""
+    sys.path.insert(0, REPO_DIR)
+    import NamedSelection as addon
+    # Registered before the first file is opened, so the named selections are read from it
+    addon.register()
+
+    job = JOB_FUNCTIONS[args.job]
+    results = []
+    for path in args.files:
+        start = time.perf_counter()
+        result = {"file": path}
+        try:
+            bpy.ops.wm.open_mainfile(filepath=path)
+            result.update(job(bpy, addon, args))
+            if result["changed"] and not args.dry_run:
+                bpy.ops.wm.save_mainfile()
+                result["saved"] = True
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.perf_counter() - start
+        results.append(result)
+
+    with open(args.result, "w") as result_file:
+        json.dump(results, result_file)
+
+
+# --------------------------------------------------------------------------------------
+# Coordinator, plain Python
+
+def expand_files(patterns):
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        files.extend(os.path.abspath(path) for path in matches)
+    # Each file must be handled by one worker only
+    return list(dict.fromkeys(files))
+
+
+def worker_command(args, files, result_path):
+    command = [args.blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--",
+               args.job, *files, "--result", result_path]
+    if args.collection:
+        command += ["--collection", args.collection]
+    if args.name:
+        command += ["--name", args.name]
+    if args.dry_run:
+        command.append("--dry-run")
+    return command
+
+
+def run_chunk(args, files):
+    """Run one Blender process on a chunk of files and return its per-file results."""
+    handle, result_path = tempfile.mkstemp(prefix="named_selections_", suffix=".json")
+    os.close(handle)
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(worker_command(args, files, result_path), stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, text=True, timeout=args.timeout)
+        try:
+            with open(result_path) as result_file:
+                results = json.load(result_file)
+        except ValueError:
+            # The process died before writing its results; report its output instead
+            tail = process.stdout[-2000:]
+            results = [{"file": path, "error": f"Blender exited with {process.returncode}: {tail}"} for path in files]
+    except subprocess.TimeoutExpired:
+        results = [{"file": path, "error": f"Blender timed out after {args.timeout} s"} for path in files]
+    except OSError as e:
+        # Blender could not be started at all
+        results = [{"file": path, "error": f"Could not run Blender: {e}"} for path in files]
+    finally:
+        os.remove(result_path)
+
+    return results, time.perf_counter() - start
+
+
+def summarize(results):
+    failed = [result for result in results if "error" in result]
+    return {
+        "files": len(results),
+        "failed": len(failed),
+        "changed": sum(1 for result in results if result.get("changed")),
+        "saved": sum(1 for result in results if result.get("saved")),
+        "file_seconds": sum(result.get("seconds", 0.0) for result in results),
+        "selections": sum(result.get("selections", 0) for result in results),
+        "members": sum(result.get("members", 0) for result in results),
+        "dangling": sum(result.get("dangling", 0) for result in results),
+        "members_added": sum(result.get("members_added", 0) for result in results),
+        "members_removed": sum(result.get("members_removed", 0) for result in results),
+    }
+
+
+def run_coordinator(args):
+    files = expand_files(args.files)
+    if not files:
+        print("No files to process")
+        return 1
+
+    chunk_size = max(1, min(args.files_per_process, -(-len(files) // max(args.workers, 1))))
+    chunks = [files[start:start + chunk_size] for start in range(0, len(files), chunk_size)]
+
+    start = time.perf_counter()
+    results = []
+    process_seconds = []
+    # Checked once up front, so a wrong path fails every file without starting any process
+    if shutil.which(args.blender) is None:
+        print(f"Blender executable not found: {args.blender}")
+        results = [{"file": path, "error": f"Blender executable not found: {args.blender}"} for path in files]
+        chunks = []
+    else:
+        print(f"{args.job}: {len(files)} files in {len(chunks)} Blender processes, {args.workers} at a time")
+    # Threads only wait for the Blender processes, which do the actual work
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_chunk, args, chunk) for chunk in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            chunk_results, seconds = future.result()
+            results.extend(chunk_results)
+            process_seconds.append(seconds)
+            for result in chunk_results:
+                status = result.get("error", "saved" if result.get("saved") else "ok")
+                print(f"  {result['file']}: {status} ({result.get('seconds', 0.0):.2f} s)")
+
+    results.sort(key=lambda result: result["file"])
+    totals = summarize(results)
+    totals["wall_seconds"] = time.perf_counter() - start
+    totals["process_seconds"] = sum(process_seconds)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "job": args.job,
+            "dry_run": args.dry_run,
+            "blender": args.blender,
+            "workers": args.workers,
+            "files_per_process": chunk_size,
+            "platform": platform.platform(),
+        },
+        "totals": totals,
+        "files": results,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+
+    print(f"\n{totals['files']} files, {totals['failed']} failed, {totals['saved']} saved"
+          f" in {totals['wall_seconds']:.1f} s; report written to {args.output}")
+    return 1 if totals["failed"] else 0
+
+
+def main():
+    try:
+        import bpy
+        in_blender = bool(bpy.app.binary_path)
+    except ImportError:
+        bpy, in_blender = None, False
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    args = parse_args(argv)
+
+    if in_blender:
+        if not args.result:
+            sys.exit("Run this script with plain Python; it starts Blender itself")
+        run_worker(bpy, args)
+    else:
+        sys.exit(run_coordinator(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,992 @@
+"""A lightweight stand-in for the parts of ``bpy`` used by the Named Selections add-on.
+
+The stand-in models just enough of Blender for the add-on to be imported, registered
+and driven from plain CPython: ID collections, objects and their selection state,
+collections, view layers, property groups, handlers and timers. It makes no attempt
+at being exact; it exists so the hot paths can be timed without a Blender build.
+
+Call ``install()`` before importing the add-on, then ``reset()`` between runs.
+"""
+
+import os
+import copy
+import sys
+import types
+import fnmatch
+
+
+# --------------------------------------------------------------------------------------
+# Properties
+
+
+class _PropertyDefinition:
+    """The value returned by the ``bpy.props`` functions.
+
+    When placed on a class (either as an annotation of a property group or operator, or
+    assigned to an ID type at register time), it acts as a descriptor that lazily
+    creates the default value on first access.
+    """
+
+    def __init__(self, kind, **options):
+        self.kind = kind
+        self.options = options
+        self.attribute = None
+
+    def __set_name__(self, owner, name):
+        self.attribute = name
+
+    def make_default(self, instance=None):
+        options = self.options
+        owner = instance if isinstance(instance, ID) else getattr(instance, "id_data", None)
+        if self.kind == "collection":
+            return PropertyCollection(options["type"], owner)
+        if self.kind == "pointer":
+            pointer_type = options["type"]
+            if isinstance(pointer_type, type) and issubclass(pointer_type, PropertyGroup):
+                group = pointer_type()
+                group.__dict__["_id_data"] = owner
+                return group
+            return None
+        if "default" in options:
+            default = options["default"]
+            return list(default) if isinstance(default, (list, tuple)) else default
+        if self.kind == "enum":
+            items = options.get("items")
+            if callable(items) or not items:
+                return ""
+            return items[0][0]
+        if self.kind in ("int_vector", "float_vector", "bool_vector"):
+            return [0] * options.get("size", 3)
+        return {"bool": False, "int": 0, "float": 0.0, "string": ""}.get(self.kind)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__.setdefault("_property_values", {})
+        try:
+            return values[self.attribute]
+        except KeyError:
+            value = values[self.attribute] = self.make_default(instance)
+            return value
+
+    def __set__(self, instance, value):
+        values = instance.__dict__.setdefault("_property_values", {})
+        if self.kind == "pointer" and isinstance(value, ID) and value is not None:
+            value.users += 1
+        previous = values.get(self.attribute)
+        if self.kind == "pointer" and isinstance(previous, ID):
+            previous.users -= 1
+        values[self.attribute] = value
+        update = self.options.get("update")
+        if update is not None:
+            update(instance, context)
+
+
+def _property_function(kind):
+    def make(**options):
+        return _PropertyDefinition(kind, **options)
+    make.__name__ = kind.title() + "Property"
+    return make
+
+
+class _StructMeta(type):
+    """Gives properties assigned to a class after its creation (``Scene.x = ...``) a name."""
+
+    def __setattr__(cls, name, value):
+        if isinstance(value, _PropertyDefinition):
+            value.attribute = name
+        super().__setattr__(name, value)
+
+
+class bpy_struct(metaclass=_StructMeta):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Annotated properties become descriptors, like Blender does at register time
+        for name, value in cls.__dict__.get("__annotations__", {}).items():
+            if isinstance(value, _PropertyDefinition):
+                definition = _PropertyDefinition(value.kind, **value.options)
+                definition.attribute = name
+                type.__setattr__(cls, name, definition)
+
+    def as_pointer(self):
+        return id(self)
+
+    @property
+    def id_data(self):
+        return self.__dict__.get("_id_data")
+
+    def property_unset(self, name):
+        self.__dict__.get("_property_values", {}).pop(name, None)
+
+    def is_property_set(self, name):
+        return name in self.__dict__.get("_property_values", {})
+
+
+class PropertyGroup(bpy_struct):
+    name = _PropertyDefinition("string", default="")
+
+
+class PropertyCollection:
+    """Stand-in for a ``CollectionProperty`` value (a bpy_prop_collection of property groups)."""
+
+    def __init__(self, item_type, owner=None):
+        self.item_type = item_type
+        self.items = []
+        self.owner = owner
+
+    def add(self):
+        item = self.item_type()
+        item.__dict__["_id_data"] = self.owner
+        self.items.append(item)
+        return item
+
+    def remove(self, index):
+        item = self.items.pop(index)
+        for value in item.__dict__.get("_property_values", {}).values():
+            if isinstance(value, ID):
+                value.users -= 1
+
+    def clear(self):
+        for index in range(len(self.items) - 1, -1, -1):
+            self.remove(index)
+
+    def move(self, source, target):
+        item = self.items.pop(source)
+        self.items.insert(target, item)
+
+    def find(self, name):
+        for index, item in enumerate(self.items):
+            if item.name == name:
+                return index
+        return -1
+
+    def get(self, name, default=None):
+        index = self.find(name)
+        return self.items[index] if index >= 0 else default
+
+    def keys(self):
+        return [item.name for item in self.items]
+
+    def values(self):
+        return list(self.items)
+
+    def foreach_get(self, attribute, sequence):
+        for index, item in enumerate(self.items):
+            sequence[index] = getattr(item, attribute)
+
+    def foreach_set(self, attribute, sequence):
+        for index, item in enumerate(self.items):
+            setattr(item, attribute, sequence[index])
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            index = self.find(key)
+            if index < 0:
+                raise KeyError(key)
+            return self.items[index]
+        return self.items[key]
+
+
+class _PropsModule(types.ModuleType):
+    pass
+
+
+props = _PropsModule("bpy.props")
+for _kind, _function in (
+        ("bool", "BoolProperty"), ("int", "IntProperty"), ("float", "FloatProperty"),
+        ("string", "StringProperty"), ("enum", "EnumProperty"), ("pointer", "PointerProperty"),
+        ("collection", "CollectionProperty"), ("bool_vector", "BoolVectorProperty"),
+        ("int_vector", "IntVectorProperty"), ("float_vector", "FloatVectorProperty")):
+    setattr(props, _function, _property_function(_kind))
+
+
+# --------------------------------------------------------------------------------------
+# Data-blocks
+
+
+class ID(bpy_struct):
+    def __init__(self, name=""):
+        self.name = name
+        self.users = 0
+        self.use_fake_user = False
+        self.library = None
+        self._custom = {}
+
+    # Custom properties
+    def __getitem__(self, key):
+        return self._custom[key]
+
+    def __setitem__(self, key, value):
+        self._custom[key] = value
+
+    def __contains__(self, key):
+        return key in self._custom
+
+    def get(self, key, default=None):
+        return self._custom.get(key, default)
+
+    def keys(self):
+        return self._custom.keys()
+
+    @property
+    def original(self):
+        return self
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class Material(ID):
+    pass
+
+
+class MeshElements:
+    """Mesh element collection with one flat array per attribute, like Blender's custom data layers.
+
+    foreach_get and foreach_set copy whole arrays, so vectorized add-on code can be
+    timed on large meshes. Attributes that were never set read as zeros.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.columns = {}
+
+    def __len__(self):
+        return self.count
+
+    def add(self, count):
+        self.count += count
+        self.columns.clear()
+
+    def foreach_get(self, attribute, sequence):
+        column = self.columns.get(attribute)
+        sequence[:] = column if column is not None else [0] * len(sequence)
+
+    def foreach_set(self, attribute, sequence):
+        self.columns[attribute] = copy.copy(sequence)
+
+
+class Mesh(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.vertices = MeshElements()
+        self.edges = MeshElements()
+        self.polygons = MeshElements()
+        self.loops = MeshElements()
+        self.materials = []
+
+    def update(self):
+        pass
+
+
+class MaterialSlot:
+    def __init__(self):
+        self.material = None
+
+
+class Object(ID):
+    def __init__(self, name="", object_data=None):
+        super().__init__(name)
+        self.data = object_data
+        self.type = "MESH" if isinstance(object_data, Mesh) else "EMPTY"
+        self.mode = "OBJECT"
+        self.hide_render = False
+        self.hide_viewport = False
+        self.hide_select = False
+        self.lock_location = [False] * 3
+        self.lock_rotation = [False] * 3
+        self.lock_scale = [False] * 3
+        self.material_slots = []
+        self.users_collection = []
+        self._selected = False
+        self._hidden = False
+
+    # Selection state lives on the view layer base in Blender; one view layer is modelled
+    def select_get(self, view_layer=None):
+        return self._selected
+
+    def select_set(self, state, view_layer=None):
+        if self not in context.scene.objects_set():
+            raise RuntimeError(f"Object '{self.name}' can't be selected because it is not in View Layer 'ViewLayer'!")
+        self._selected = bool(state)
+
+    def hide_get(self, view_layer=None):
+        return self._hidden
+
+    def hide_set(self, state, view_layer=None):
+        self._hidden = bool(state)
+
+    def visible_get(self, view_layer=None):
+        return not self._hidden and not self.hide_viewport
+
+    def update_from_editmode(self):
+        return True
+
+    @property
+    def active_material(self):
+        return self.material_slots[0].material if self.material_slots else None
+
+    @active_material.setter
+    def active_material(self, material):
+        if not self.material_slots:
+            self.material_slots.append(MaterialSlot())
+        self.material_slots[0].material = material
+
+    @property
+    def users_scene(self):
+        return tuple(scene for scene in data.scenes if self in scene.objects_set())
+
+
+class IDCollection:
+    """Stand-in for ``bpy.data.<type>`` collections."""
+
+    def __init__(self, id_type):
+        self.id_type = id_type
+        self.by_name = {}
+
+    def _unique_name(self, name):
+        if name not in self.by_name:
+            return name
+        counter = 1
+        while f"{name}.{counter:03d}" in self.by_name:
+            counter += 1
+        return f"{name}.{counter:03d}"
+
+    def new(self, name, *args):
+        block = self.id_type(self._unique_name(name), *args)
+        self.by_name[block.name] = block
+        return block
+
+    def remove(self, block, do_unlink=True):
+        self.by_name.pop(block.name, None)
+        if isinstance(block, Object):
+            for collection in list(block.users_collection):
+                collection.objects.unlink(block)
+        if isinstance(block, Collection):
+            for ob in list(block.objects):
+                block.objects.unlink(ob)
+        for scene in data.scenes:
+            scene._invalidate()
+        block.__dict__["_removed"] = True
+
+    def rename(self, block, name):
+        self.by_name.pop(block.name, None)
+        block.name = self._unique_name(name)
+        self.by_name[block.name] = block
+
+    def get(self, name, default=None):
+        return self.by_name.get(name, default)
+
+    def keys(self):
+        return list(self.by_name.keys())
+
+    def values(self):
+        return list(self.by_name.values())
+
+    def foreach_get(self, attribute, sequence):
+        for index, block in enumerate(self.by_name.values()):
+            sequence[index] = getattr(block, attribute)
+
+    def foreach_set(self, attribute, sequence):
+        for index, block in enumerate(self.by_name.values()):
+            setattr(block, attribute, sequence[index])
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def __iter__(self):
+        return iter(list(self.by_name.values()))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.by_name[key]
+        return list(self.by_name.values())[key]
+
+
+class CollectionObjects:
+    def __init__(self, owner):
+        self.owner = owner
+        self.objects = {}
+
+    def link(self, ob):
+        if ob in self.objects:
+            raise RuntimeError(f"Object '{ob.name}' already in collection '{self.owner.name}'")
+        self.objects[ob] = None
+        ob.users += 1
+        ob.users_collection.append(self.owner)
+        data._scene_changed()
+
+    def unlink(self, ob):
+        if ob not in self.objects:
+            raise RuntimeError(f"Object '{ob.name}' not in collection '{self.owner.name}'")
+        del self.objects[ob]
+        ob.users -= 1
+        ob.users_collection.remove(self.owner)
+        data._scene_changed()
+
+    def get(self, name, default=None):
+        for ob in self.objects:
+            if ob.name == name:
+                return ob
+        return default
+
+    def foreach_get(self, attribute, sequence):
+        for index, ob in enumerate(self.objects):
+            sequence[index] = getattr(ob, attribute)
+
+    def foreach_set(self, attribute, sequence):
+        for index, ob in enumerate(self.objects):
+            setattr(ob, attribute, sequence[index])
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return self.get(key) is not None
+        return key in self.objects
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __bool__(self):
+        return bool(self.objects)
+
+    def __iter__(self):
+        return iter(list(self.objects))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            found = self.get(key)
+            if found is None:
+                raise KeyError(key)
+            return found
+        return list(self.objects)[key]
+
+
+class CollectionChildren(list):
+    def link(self, child):
+        if child in self:
+            raise RuntimeError(f"Collection '{child.name}' already in collection")
+        self.append(child)
+        data._scene_changed()
+
+    def unlink(self, child):
+        self.remove(child)
+        data._scene_changed()
+
+
+class Collection(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.objects = CollectionObjects(self)
+        self.children = CollectionChildren()
+        self.hide_render = False
+        self.hide_viewport = False
+
+    @property
+    def all_objects(self):
+        seen = dict.fromkeys(self.objects)
+        for child in self.children:
+            seen.update(dict.fromkeys(child.all_objects))
+        return list(seen)
+
+    def copy(self):
+        duplicate = data.collections.new(self.name)
+        for ob in self.objects:
+            duplicate.objects.link(ob)
+        duplicate.children = CollectionChildren(self.children)
+        return duplicate
+
+
+class LayerObjects:
+    def __init__(self, scene):
+        self.scene = scene
+        self.active = None
+
+    @property
+    def selected(self):
+        return [ob for ob in self.scene.objects_set() if ob._selected]
+
+    def __iter__(self):
+        return iter(self.scene.objects)
+
+    def __len__(self):
+        return len(self.scene.objects_set())
+
+    def __contains__(self, ob):
+        return ob in self.scene.objects_set()
+
+    def get(self, name, default=None):
+        ob = data.objects.get(name)
+        return ob if ob in self.scene.objects_set() else default
+
+
+class ViewLayer(bpy_struct):
+    def __init__(self, scene):
+        self.name = "ViewLayer"
+        self.objects = LayerObjects(scene)
+
+    def update(self):
+        pass
+
+
+class ToolSettings:
+    def __init__(self):
+        self.mesh_select_mode = [True, False, False]
+
+
+class Scene(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.view_layers = [ViewLayer(self)]
+        self.tool_settings = ToolSettings()
+        self._objects_cache = None
+
+    def _invalidate(self):
+        self._objects_cache = None
+
+    def objects_set(self):
+        if self._objects_cache is None:
+            self._objects_cache = dict.fromkeys(self.collection.all_objects)
+        return self._objects_cache
+
+    @property
+    def objects(self):
+        return list(self.objects_set())
+
+
+class WindowManager(ID):
+    # Like background mode, there is no add-on key configuration to add shortcuts to
+    keyconfigs = types.SimpleNamespace(addon=None)
+
+
+class Area:
+    def __init__(self, area_type):
+        self.type = area_type
+        self.redraws = 0
+
+    def tag_redraw(self):
+        self.redraws += 1
+
+
+class Screen:
+    def __init__(self):
+        self.areas = [Area("VIEW_3D"), Area("PROPERTIES")]
+
+
+class DepsgraphUpdate:
+    def __init__(self, id_data, transform=False, geometry=False, shading=False):
+        self.id = id_data
+        self.is_updated_transform = transform
+        self.is_updated_geometry = geometry
+        self.is_updated_shading = shading
+
+
+class Depsgraph:
+    def __init__(self, updates=()):
+        self.updates = list(updates)
+
+    def id_type_updated(self, id_type):
+        return any(type(update.id).__name__.upper() == id_type for update in self.updates)
+
+
+class BlendData:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.objects = IDCollection(Object)
+        self.collections = IDCollection(Collection)
+        self.materials = IDCollection(Material)
+        self.meshes = IDCollection(Mesh)
+        self.scenes = IDCollection(Scene)
+        self.window_managers = IDCollection(WindowManager)
+        self.filepath = ""
+        self.is_dirty = False
+
+    def _scene_changed(self):
+        for scene in self.scenes.by_name.values():
+            scene._invalidate()
+
+
+class Preferences:
+    def __init__(self):
+        self.addons = {}
+
+
+class Context:
+    """Stand-in for ``bpy.context``; selection is derived from the objects on demand."""
+
+    def __init__(self):
+        self.scene = None
+        self.window_manager = None
+        self.screen = Screen()
+        self.mode = "OBJECT"
+        self.preferences = Preferences()
+        self.area = None
+        self.region = None
+        self.window = None
+
+    @property
+    def view_layer(self):
+        return self.scene.view_layers[0]
+
+    @property
+    def selected_objects(self):
+        return self.view_layer.objects.selected
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def object(self):
+        return self.active_object
+
+    @property
+    def tool_settings(self):
+        return self.scene.tool_settings
+
+    @property
+    def objects_in_mode(self):
+        active = self.active_object
+        return [active] if active is not None and active.mode != "OBJECT" else []
+
+    @property
+    def collection(self):
+        return self.scene.collection
+
+
+# --------------------------------------------------------------------------------------
+# Types that only need to exist
+
+
+class Operator(bpy_struct):
+    bl_options = set()
+
+    def __init__(self):
+        self.reports = []
+        self.layout = Layout()
+
+    @property
+    def properties(self):
+        return self
+
+    def report(self, level, message):
+        self.reports.append((set(level), message))
+
+
+class Layout:
+    """Accepts any layout call and returns itself, so UI code can be driven without a UI."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self._call
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return self
+
+
+class Panel(bpy_struct):
+    def __init__(self):
+        self.layout = Layout()
+
+
+class Menu(Panel):
+    pass
+
+
+class _AppendableMenu(Menu):
+    """A built-in menu that add-ons extend with draw functions."""
+
+    draw_functions = None
+
+    @classmethod
+    def append(cls, draw_function):
+        cls.draw_functions.append(draw_function)
+
+    @classmethod
+    def remove(cls, draw_function):
+        cls.draw_functions.remove(draw_function)
+
+
+class TOPBAR_MT_file_export(_AppendableMenu):
+    draw_functions = []
+
+
+class TOPBAR_MT_file_import(_AppendableMenu):
+    draw_functions = []
+
+
+class UIList(bpy_struct):
+    def __init__(self):
+        self.layout = Layout()
+        self.filter_name = ""
+        self.use_filter_sort_alpha = False
+        self.use_filter_sort_reverse = False
+        self.use_filter_invert = False
+        self.bitflag_filter_item = 1 << 30
+
+
+class UI_UL_list(UIList):
+    @staticmethod
+    def filter_items_by_name(pattern, bitflag, items, propname="name", flags=None, reverse=False):
+        if not pattern or len(items) == 0:
+            return []
+        if flags is None:
+            flags = [0] * len(items)
+        pattern = f"*{pattern}*" if "*" not in pattern else pattern
+        for index, item in enumerate(items):
+            name = getattr(item, propname, "")
+            if fnmatch.fnmatch(name.lower(), pattern.lower()) != reverse:
+                flags[index] |= bitflag
+        return flags
+
+    @staticmethod
+    def sort_items_by_name(items, propname="name"):
+        order = sorted(enumerate(items), key=lambda pair: getattr(pair[1], propname).lower())
+        new_order = [0] * len(items)
+        for new_index, (old_index, _item) in enumerate(order):
+            new_order[old_index] = new_index
+        return new_order
+
+
+class AddonPreferences(bpy_struct):
+    pass
+
+
+class KeyMapItems(list):
+    def new(self, idname, type, value, **modifiers):
+        item = types.SimpleNamespace(idname=idname, type=type, value=value, properties=types.SimpleNamespace(), **modifiers)
+        self.append(item)
+        return item
+
+
+class KeyMaps(dict):
+    def new(self, name, space_type="EMPTY", region_type="WINDOW"):
+        keymap = self.setdefault(name, types.SimpleNamespace(name=name, keymap_items=KeyMapItems()))
+        return keymap
+
+
+class _Handlers(types.SimpleNamespace):
+    persistent = staticmethod(lambda function: function)
+
+
+class _Timers:
+    """Matches functions by identity like Blender does, so a fresh bound method is a different timer."""
+
+    def __init__(self):
+        self.registered = []
+
+    def _find(self, function):
+        for index, (registered, _interval) in enumerate(self.registered):
+            if registered is function:
+                return index
+        return None
+
+    def register(self, function, first_interval=0.0, persistent=False):
+        index = self._find(function)
+        if index is None:
+            self.registered.append((function, first_interval))
+        else:
+            self.registered[index] = (function, first_interval)
+
+    def unregister(self, function):
+        index = self._find(function)
+        if index is None:
+            raise ValueError("Error: function is not registered")
+        del self.registered[index]
+
+    def is_registered(self, function):
+        return self._find(function) is not None
+
+    def run_all(self):
+        """Call every pending timer once, like the event loop would after the interval."""
+        pending, self.registered = self.registered, []
+        for function, _interval in pending:
+            interval = function()
+            if interval is not None:
+                self.register(function, interval)
+
+
+# --------------------------------------------------------------------------------------
+# Module assembly
+
+data = BlendData()
+context = Context()
+
+_TYPE_NAMES = (
+    "bpy_struct", "ID", "PropertyGroup", "Object", "Scene", "Collection", "Material", "Mesh",
+    "WindowManager", "Operator", "Panel", "Menu", "UIList", "UI_UL_list", "AddonPreferences",
+    "ViewLayer", "Depsgraph", "TOPBAR_MT_file_export", "TOPBAR_MT_file_import",
+)
+
+
+def _mode_set(mode):
+    """Stand-in for ``bpy.ops.object.mode_set``; edit mode takes in every selected mesh."""
+    editing = mode == "EDIT"
+    for ob in context.scene.objects:
+        ob.mode = "EDIT" if editing and ob.type == "MESH" and ob._selected else "OBJECT"
+    context.mode = "EDIT_MESH" if editing else "OBJECT"
+    return {"FINISHED"}
+
+
+def _build_modules():
+    bpy = types.ModuleType("bpy")
+    bpy.__file__ = __file__
+    bpy.data = data
+    bpy.context = context
+    bpy.props = props
+
+    bpy_types = types.ModuleType("bpy.types")
+    for name in _TYPE_NAMES:
+        setattr(bpy_types, name, globals()[name])
+    bpy.types = bpy_types
+
+    handler_lists = {name: [] for name in (
+        "depsgraph_update_pre", "depsgraph_update_post", "load_pre", "load_post", "save_pre",
+        "save_post", "undo_pre", "undo_post", "redo_pre", "redo_post", "frame_change_post")}
+    handlers = _Handlers(**handler_lists)
+    timers = _Timers()
+    app = types.ModuleType("bpy.app")
+    app.handlers = handlers
+    app.timers = timers
+    app.background = True
+    app.binary_path = ""
+    app.version = (2, 93, 0)
+    app.version_string = "2.93.0 (stand-in)"
+    bpy.app = app
+
+    utils = types.ModuleType("bpy.utils")
+    utils.registered = []
+    utils.register_class = utils.registered.append
+    utils.unregister_class = utils.registered.remove
+    utils.user_resource = lambda resource_type, path="", create=False: path
+    bpy.utils = utils
+
+    path = types.ModuleType("bpy.path")
+    path.abspath = lambda filepath, start=None, library=None: os.path.abspath(filepath)
+    bpy.path = path
+
+    ops = types.ModuleType("bpy.ops")
+    ops.object = types.SimpleNamespace(mode_set=_mode_set)
+    bpy.ops = ops
+
+    bpy_extras = types.ModuleType("bpy_extras")
+    io_utils = types.ModuleType("bpy_extras.io_utils")
+
+    class ExportHelper:
+        filepath: props.StringProperty(subtype="FILE_PATH")
+
+    class ImportHelper:
+        filepath: props.StringProperty(subtype="FILE_PATH")
+
+    io_utils.ExportHelper = ExportHelper
+    io_utils.ImportHelper = ImportHelper
+    bpy_extras.io_utils = io_utils
+
+    addon_utils = types.ModuleType("addon_utils")
+    addon_utils.modules = lambda *args, **kwargs: []
+
+    return {
+        "bpy": bpy, "bpy.types": bpy_types, "bpy.props": props, "bpy.app": app,
+        "bpy.app.handlers": handlers, "bpy.app.timers": timers, "bpy.utils": utils, "bpy.path": path, "bpy.ops": ops,
+        "bpy_extras": bpy_extras, "bpy_extras.io_utils": io_utils, "addon_utils": addon_utils,
+    }
+
+
+def install():
+    """Register the stand-in modules in ``sys.modules`` and return the fake ``bpy``."""
+    modules = _build_modules()
+    sys.modules.update(modules)
+    reset()
+    return modules["bpy"]
+
+
+def reset():
+    """Start from an empty file with a single scene, like ``File > New > General`` minus the cube."""
+    data.reset()
+    scene = data.scenes.new("Scene")
+    context.scene = scene
+    context.window_manager = data.window_managers.new("WinMan")
+    context.mode = "OBJECT"
+    return scene
+
+
+def populate(object_count, prefix="Object"):
+    """Create ``object_count`` empties linked to the scene collection and return them."""
+    scene = context.scene
+    objects = []
+    link = scene.collection.objects.link
+    for index in range(object_count):
+        ob = data.objects.new(f"{prefix}.{index:06d}", None)
+        link(ob)
+        objects.append(ob)
+    return objects
+
+
+def select(objects, active=None):
+    for ob in objects:
+        ob._selected = True
+    context.view_layer.objects.active = active if active is not None else (objects[0] if objects else None)
+
+
+def deselect_all():
+    for ob in context.scene.objects:
+        ob._selected = False
+
+
+def grid_mesh(name, rows, columns):
+    """Create a mesh object with a grid of rows x columns quads linked to the scene.
+
+    Needs NumPy; the topology arrays are filled with foreach_set like an importer would.
+    """
+    import numpy as np
+
+    mesh = data.meshes.new(name)
+    vertex_columns = columns + 1
+    vertex_index = np.arange((rows + 1) * vertex_columns, dtype=np.int32).reshape(rows + 1, vertex_columns)
+
+    # Horizontal edges first, then vertical ones
+    horizontal = np.stack([vertex_index[:, :-1], vertex_index[:, 1:]], axis=-1).reshape(-1, 2)
+    vertical = np.stack([vertex_index[:-1, :], vertex_index[1:, :]], axis=-1).reshape(-1, 2)
+    edge_vertices = np.concatenate([horizontal, vertical])
+    horizontal_index = np.arange(len(horizontal), dtype=np.int32).reshape(rows + 1, columns)
+    vertical_index = (len(horizontal) + np.arange(len(vertical), dtype=np.int32)).reshape(rows, vertex_columns)
+
+    # Each quad runs bottom edge, right edge, top edge, left edge
+    loop_vertices = np.stack([vertex_index[:-1, :-1], vertex_index[:-1, 1:], vertex_index[1:, 1:],
+                              vertex_index[1:, :-1]], axis=-1).reshape(-1)
+    loop_edges = np.stack([horizontal_index[:-1, :], vertical_index[:, 1:], horizontal_index[1:, :],
+                           vertical_index[:, :-1]], axis=-1).reshape(-1)
+    face_count = rows * columns
+
+    mesh.vertices.add(vertex_index.size)
+    mesh.edges.add(len(edge_vertices))
+    mesh.edges.foreach_set("vertices", edge_vertices.reshape(-1))
+    mesh.loops.add(len(loop_vertices))
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.loops.foreach_set("edge_index", loop_edges)
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, 4 * face_count, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(face_count, 4, dtype=np.int32))
+
+    ob = data.objects.new(name, mesh)
+    context.scene.collection.objects.link(ob)
+    return ob
@@ -0,0 +1,407 @@
+"""Benchmarks for the hot paths of the Named Selections add-on.
+
+Runs on plain CPython against the ``bpy`` stand-in in ``fake_bpy.py``:
+
+    python benchmarks/run_benchmarks.py
+
+or inside Blender, against the real API:
+
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --objects 1000 10000
+
+Every case is timed for each combination of object count and named selection count,
+and the results are written as JSON so that runs can be compared with ``--compare``.
+Numbers from the stand-in are only comparable with other stand-in runs.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import types
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+
+
+def load_bpy():
+    """Return the real bpy module when running inside Blender, otherwise install the stand-in."""
+    try:
+        import bpy
+        if bpy.app.binary_path:
+            return bpy, None
+    except ImportError:
+        pass
+
+    sys.path.insert(0, BENCHMARK_DIR)
+    import fake_bpy
+    return fake_bpy.install(), fake_bpy
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="object counts to benchmark")
+    parser.add_argument("--selections", type=int, nargs="+", default=[10, 1000],
+                        help="named selection counts to benchmark")
+    parser.add_argument("--member-budget", type=int, default=200000,
+                        help="upper bound for the total number of members over all named selections")
+    parser.add_argument("--faces", type=int, default=2000000,
+                        help="face count of the mesh used by the element selection cases (needs NumPy)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs per case")
+    parser.add_argument("--cases", nargs="+", help="only run the cases whose name starts with one of these")
+    parser.add_argument("--output", help="path of the JSON report (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="a previous JSON report to compare the results with")
+    return parser.parse_args(argv)
+
+
+class Harness:
+    """Builds benchmark scenes and drives the add-on through either the stand-in or Blender."""
+
+    def __init__(self, bpy, fake_bpy, addon, face_count):
+        self.bpy = bpy
+        self.fake_bpy = fake_bpy
+        self.addon = addon
+        self.face_count = face_count
+        self.grid = None
+
+    @property
+    def context(self):
+        return self.bpy.context
+
+    def new_scene(self, object_count, selection_count, member_budget):
+        """Start from an empty file with object_count objects and selection_count named selections."""
+        bpy = self.bpy
+        if self.fake_bpy is not None:
+            self.fake_bpy.reset()
+        else:
+            bpy.ops.wm.read_homefile(use_empty=True)
+        self.addon.reset_named_selection_state()
+        self.grid = None
+
+        scene = self.context.scene
+        link = scene.collection.objects.link
+        self.objects = []
+        for index in range(object_count):
+            obj = bpy.data.objects.new(f"Object.{index:06d}", None)
+            link(obj)
+            self.objects.append(obj)
+
+        # Selections hold overlapping slices of the objects, capped by the member budget
+        self.members_per_selection = max(1, min(object_count // 10, member_budget // max(selection_count, 1)))
+        step = max(1, (object_count - self.members_per_selection) // max(selection_count, 1))
+        for index in range(selection_count):
+            start = (index * step) % max(object_count - self.members_per_selection, 1)
+            named_selection = self.addon.new_named_selection(scene, f"Selection.{index:04d}")
+            self.addon.add_members(named_selection, self.objects[start:start + self.members_per_selection])
+        scene.named_selections_index = 0
+
+    def select(self, objects):
+        view_layer = self.context.view_layer
+        for obj in view_layer.objects.selected:
+            obj.select_set(False)
+        for obj in objects:
+            obj.select_set(True)
+        view_layer.objects.active = objects[0] if objects else None
+
+    def run_operator(self, operator_class, **properties):
+        """Run an operator's execute, directly on the stand-in or through bpy.ops in Blender."""
+        if self.fake_bpy is not None:
+            operator = operator_class()
+            for name, value in properties.items():
+                setattr(operator, name, value)
+            return operator.execute(self.context)
+
+        category, name = operator_class.bl_idname.split(".")
+        return getattr(getattr(self.bpy.ops, category), name)('EXEC_DEFAULT', **properties)
+
+    def edit_grid(self, every=3):
+        """Enter edit mode on a grid of about face_count faces with every n-th face selected (none if 0)."""
+        import numpy as np
+        bpy = self.bpy
+        side = max(1, int(self.face_count ** 0.5))
+
+        if self.context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+        if self.grid is None:
+            if self.fake_bpy is not None:
+                self.grid = self.fake_bpy.grid_mesh("Grid", side, side)
+            else:
+                bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side)
+                self.grid = self.context.active_object
+
+        mesh = self.grid.data
+        mask = np.zeros(len(mesh.polygons), dtype=bool)
+        if every:
+            mask[::every] = True
+        self.addon.write_element_selection(mesh, 'FACE', mask)
+
+        self.select([self.grid])
+        self.context.scene.tool_settings.mesh_select_mode = [False, False, True]
+        bpy.ops.object.mode_set(mode='EDIT')
+
+    def leave_edit_mode(self):
+        if self.context.mode != 'OBJECT':
+            self.bpy.ops.object.mode_set(mode='OBJECT')
+
+    def draw_panel(self):
+        """Draw NamedSelectionsPanel into a layout that records nothing."""
+        sys.path.insert(0, BENCHMARK_DIR)
+        from fake_bpy import Layout
+
+        panel_class = self.addon.NamedSelectionsPanel
+        methods = {name: value for name, value in vars(panel_class).items() if callable(value)}
+        host = type("PanelHost", (), methods)()
+        host.layout = Layout()
+        host.draw(self.context)
+
+
+def transform_depsgraph(objects):
+    """A depsgraph stand-in reporting a transform update, like each frame of a grab."""
+    updates = [types.SimpleNamespace(id=obj, is_updated_transform=True, is_updated_geometry=False,
+                                     is_updated_shading=False) for obj in objects]
+    return types.SimpleNamespace(updates=updates)
+
+
+def define_cases(harness):
+    """Return the benchmark cases as (name, setup, run, teardown) tuples; only run is timed."""
+    addon = harness.addon
+
+    def active_selection():
+        scene = harness.context.scene
+        return scene.named_selections[scene.named_selections_index]
+
+    def slice_for_editing():
+        objects = harness.objects
+        count = harness.members_per_selection
+        # Half of these objects are already members of the first selection
+        start = count // 2
+        return objects[start:start + count]
+
+    def setup_add_named_selection():
+        harness.select(harness.objects[:harness.members_per_selection])
+
+    def run_add_named_selection():
+        harness.run_operator(addon.AddNamedSelection, name="Benchmark")
+
+    def teardown_add_named_selection():
+        scene = harness.context.scene
+        harness.run_operator(addon.RemoveNamedSelection)
+        scene.named_selections_index = 0
+
+    def setup_select():
+        harness.select(harness.objects[-harness.members_per_selection:])
+
+    def run_select():
+        harness.run_operator(addon.SelectNamedSelection, mode='REPLACE')
+
+    def setup_add_objects():
+        harness.select(slice_for_editing())
+
+    def run_add_objects():
+        harness.run_operator(addon.AddObjectToNamedSelection)
+
+    def teardown_add_objects():
+        named_selection = active_selection()
+        addon.remove_members(named_selection, slice_for_editing())
+        addon.add_members(named_selection, harness.objects[:harness.members_per_selection])
+
+    def run_remove_objects():
+        harness.run_operator(addon.RemoveObjectFromNamedSelection)
+
+    def teardown_remove_objects():
+        addon.add_members(active_selection(), harness.objects[:harness.members_per_selection])
+
+    def run_disable_render():
+        harness.run_operator(addon.NamedSelectionBulkAction, action='DISABLE_RENDER')
+
+    def teardown_disable_render():
+        addon.set_member_flags(active_selection(), "hide_render", False)
+
+    def run_hide():
+        harness.run_operator(addon.NamedSelectionBulkAction, action='HIDE')
+
+    def teardown_hide():
+        addon.set_objects_hidden(harness.context.view_layer, harness.objects, False)
+
+    def setup_move():
+        bpy = harness.bpy
+        target = bpy.data.collections.get("Benchmark Target")
+        if target is None:
+            target = bpy.data.collections.new("Benchmark Target")
+            harness.context.scene.collection.children.link(target)
+
+    def run_move():
+        harness.run_operator(addon.NamedSelectionBulkAction, action='MOVE_TO_COLLECTION', collection="Benchmark Target")
+
+    def teardown_move():
+        addon.move_objects_to_collection(harness.context.scene, harness.objects, harness.context.scene.collection)
+
+    def setup_restore_selection():
+        # The previous selection is the first named selection, the current one the last
+        context = harness.context
+        harness.select(harness.objects[:harness.members_per_selection])
+        addon.capture_selection(context.view_layer, context.window_manager)
+        harness.select(harness.objects[-harness.members_per_selection:])
+        addon.capture_selection(context.view_layer, context.window_manager)
+
+    def run_restore_selection():
+        harness.run_operator(addon.RestoreSelectionSnapshot, index=1)
+
+    def setup_transform_tick():
+        # Let one full pass happen so that the next tick sees no structural change
+        addon.update_named_selections(harness.context.scene)
+
+    def run_transform_tick():
+        addon.update_named_selections(harness.context.scene, transform_depsgraph(harness.objects[:10]))
+
+    def run_structural_tick():
+        addon.update_named_selections(harness.context.scene, None)
+
+    def run_reconcile():
+        addon.reconcile_named_selections(harness.bpy.data.scenes)
+
+    def setup_cold_draw():
+        addon.mark_named_selections_changed()
+
+    def setup_store_faces():
+        harness.edit_grid()
+
+    def run_store_faces():
+        harness.run_operator(addon.AddNamedSelection, name="Faces")
+
+    def teardown_store_faces():
+        harness.leave_edit_mode()
+        teardown_add_named_selection()
+
+    def setup_restore_faces():
+        harness.edit_grid()
+        scene = harness.context.scene
+        if scene.named_selections.find("Faces") < 0:
+            run_store_faces()
+        harness.edit_grid(every=0)
+        scene.named_selections_index = scene.named_selections.find("Faces")
+
+    def teardown_restore_faces():
+        harness.leave_edit_mode()
+        harness.context.scene.named_selections_index = 0
+
+    element_cases = [
+        ("AddNamedSelection (faces)", setup_store_faces, run_store_faces, teardown_store_faces),
+        ("SelectNamedSelection (faces)", setup_restore_faces, run_select, teardown_restore_faces),
+    ]
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy is not installed, skipping the element selection cases")
+        element_cases = []
+
+    return [
+        ("AddNamedSelection", setup_add_named_selection, run_add_named_selection, teardown_add_named_selection),
+        ("SelectNamedSelection", setup_select, run_select, None),
+        ("AddObjectToNamedSelection", setup_add_objects, run_add_objects, teardown_add_objects),
+        ("RemoveObjectFromNamedSelection", setup_add_objects, run_remove_objects, teardown_remove_objects),
+        ("RestoreSelectionSnapshot", setup_restore_selection, run_restore_selection, None),
+        ("NamedSelectionBulkAction (render)", None, run_disable_render, teardown_disable_render),
+        ("NamedSelectionBulkAction (hide)", None, run_hide, teardown_hide),
+        ("NamedSelectionBulkAction (move)", setup_move, run_move, teardown_move),
+        ("update_named_selections (transform tick)", setup_transform_tick, run_transform_tick, None),
+        ("update_named_selections (structural tick)", None, run_structural_tick, None),
+        ("reconcile_named_selections", None, run_reconcile, None),
+        ("NamedSelectionsPanel.draw (cold)", setup_cold_draw, harness.draw_panel, None),
+        ("NamedSelectionsPanel.draw (warm)", harness.draw_panel, harness.draw_panel, None),
+    ] + element_cases
+
+
+def time_case(setup, run, teardown, repeat):
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+        if teardown is not None:
+            teardown()
+    return samples
+
+
+def compare(results, previous_path):
+    with open(previous_path) as previous_file:
+        previous = json.load(previous_file)
+    baseline = {(r["case"], r["objects"], r["selections"]): r["median"] for r in previous["results"]}
+
+    print(f"\nCompared with {previous_path} (ratio of medians, lower is faster):")
+    for result in results:
+        before = baseline.get((result["case"], result["objects"], result["selections"]))
+        if before:
+            print(f"  {result['case']:<45} {result['objects']:>7} obj {result['selections']:>5} sel"
+                  f"  {result['median'] / before:6.2f}x")
+
+
+def main():
+    args = parse_args()
+    bpy, fake_bpy = load_bpy()
+
+    sys.path.insert(0, REPO_DIR)
+    import NamedSelection as addon
+    if not hasattr(bpy.types.Scene, "named_selections"):
+        addon.register()
+
+    harness = Harness(bpy, fake_bpy, addon, args.faces)
+    cases = define_cases(harness)
+    if args.cases:
+        cases = [case for case in cases if case[0].startswith(tuple(args.cases))]
+
+    results = []
+    for object_count in args.objects:
+        for selection_count in args.selections:
+            harness.new_scene(object_count, selection_count, args.member_budget)
+            for name, setup, run, teardown in cases:
+                samples = time_case(setup, run, teardown, args.repeat)
+                result = {
+                    "case": name,
+                    "objects": object_count,
+                    "selections": selection_count,
+                    "members_per_selection": harness.members_per_selection,
+                    "samples": samples,
+                    "min": min(samples),
+                    "median": statistics.median(samples),
+                    "mean": statistics.fmean(samples),
+                }
+                results.append(result)
+                print(f"{name:<45} {object_count:>7} obj {selection_count:>5} sel"
+                      f"  median {result['median'] * 1000.0:10.3f} ms  min {result['min'] * 1000.0:10.3f} ms")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "backend": "stand-in" if fake_bpy is not None else f"blender {bpy.app.version_string}",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "member_budget": args.member_budget,
+        },
+        "results": results,
+    }
+
+    output = args.output
+    if output is None:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(BENCHMARK_DIR, "results", f"benchmark-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
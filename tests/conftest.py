@@ -0,0 +1,43 @@
+"""Runs the add-on against the bpy stand-in of the benchmark suite."""
+
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+sys.path.insert(0, REPO_DIR)
+
+import fake_bpy  # noqa: E402
+
+bpy = fake_bpy.install()
+
+import NamedSelection  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def addon():
+    NamedSelection.register()
+    yield NamedSelection
+    NamedSelection.unregister()
+
+
+@pytest.fixture(name="fake_bpy")
+def fake_bpy_module():
+    return fake_bpy
+
+
+@pytest.fixture
+def scene(addon):
+    """An empty scene with the caches of the add-on cleared, like after opening a file."""
+    scene = fake_bpy.reset()
+    addon.reset_named_selection_state()
+    bpy.app.timers.registered.clear()
+    return scene
+
+
+@pytest.fixture
+def objects(scene):
+    return fake_bpy.populate(8)
@@ -0,0 +1,49 @@
+import pytest
+
+
+def test_indices_round_trip(addon):
+    indices = [0, 3, 7, 8, 64, 1000]
+    bits = addon.get_indices_bitset(indices, 1001)
+    assert bits == sum(1 << index for index in indices)
+    assert addon.get_bitset_indices(bits) == indices
+    assert addon.get_bitset_indices(0) == []
+
+
+def test_objects_bitset_indexes_new_objects(addon, objects):
+    bits = addon.get_objects_bitset([objects[2], objects[5]])
+    indexer = addon.get_object_indexer()
+    assert indexer.objects == [objects[2], objects[5]]
+    assert addon.get_bitset_objects(bits) == [objects[2], objects[5]]
+
+    # Known objects keep their index
+    assert addon.get_objects_bitset([objects[5]]) == 0b10
+
+
+@pytest.mark.parametrize("operation, expected", [
+    ('UNION', [0, 1, 2, 3, 4]),
+    ('INTERSECTION', [2]),
+    ('DIFFERENCE', [0, 1]),
+])
+def test_combine_named_selections(addon, scene, objects, operation, expected):
+    first = addon.new_named_selection(scene, "First")
+    second = addon.new_named_selection(scene, "Second")
+    addon.add_members(first, objects[0:3])
+    addon.add_members(second, objects[2:5])
+
+    result = addon.combine_named_selections(first, second, operation)
+    assert sorted(result, key=objects.index) == [objects[index] for index in expected]
+
+
+def test_combine_rejects_unknown_operation(addon, scene):
+    first = addon.new_named_selection(scene, "First")
+    with pytest.raises(ValueError):
+        addon.combine_named_selections(first, first, 'XOR')
+
+
+def test_selection_bitset_follows_member_changes(addon, scene, objects):
+    named_selection = addon.new_named_selection(scene, "Selection")
+    addon.add_members(named_selection, objects[:2])
+    assert addon.get_bitset_objects(addon.get_selection_bitset(named_selection)) == objects[:2]
+
+    addon.remove_members(named_selection, objects[:1])
+    assert addon.get_bitset_objects(addon.get_selection_bitset(named_selection)) == objects[1:2]
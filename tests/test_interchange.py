@@ -0,0 +1,80 @@
+import pytest
+
+
+@pytest.fixture
+def exported(addon, scene, objects, tmp_path):
+    """Two named selections written to an interchange file, one of them with a rule."""
+    trees = addon.new_named_selection(scene, "Trees")
+    addon.add_members(trees, objects[0:3])
+    rocks = addon.new_named_selection(scene, "Rocks")
+    addon.add_members(rocks, objects[3:5])
+    rule = rocks.rules.add()
+    rule.rule_type = 'NAME'
+    rule.pattern = "Rock*"
+
+    path = str(tmp_path / "selections.jsonl")
+    assert addon.export_named_selections(scene, path, chunk_size=2) == (2, 5)
+    return path
+
+
+def members(addon, named_selection):
+    return list(addon.get_stored_objects(named_selection))
+
+
+def test_merge_keeps_existing_and_renames_imported(addon, scene, objects, exported):
+    selections, added, missing = addon.import_named_selections(scene, exported, 'MERGE')
+
+    assert (selections, added, missing) == (2, 5, 0)
+    assert [ns.name for ns in scene.named_selections] == ["Trees", "Rocks", "Trees.01", "Rocks.01"]
+    assert members(addon, scene.named_selections["Trees.01"]) == objects[0:3]
+    rules = scene.named_selections["Rocks.01"].rules
+    assert [(rule.rule_type, rule.pattern) for rule in rules] == [('NAME', "Rock*")]
+
+
+def test_update_adds_to_selections_of_the_same_name(addon, scene, objects, exported):
+    trees = scene.named_selections["Trees"]
+    addon.remove_members(trees, objects[0:2])
+    addon.add_members(trees, objects[7:8])
+
+    selections, added, missing = addon.import_named_selections(scene, exported, 'UPDATE')
+
+    assert (selections, added, missing) == (2, 2, 0)
+    assert len(scene.named_selections) == 2
+    assert set(members(addon, trees)) == {objects[0], objects[1], objects[2], objects[7]}
+
+
+def test_replace_removes_existing_selections(addon, scene, objects, exported):
+    addon.new_named_selection(scene, "Lights")
+
+    selections, added, missing = addon.import_named_selections(scene, exported, 'REPLACE')
+
+    assert (selections, added, missing) == (2, 5, 0)
+    assert [ns.name for ns in scene.named_selections] == ["Trees", "Rocks"]
+    assert members(addon, scene.named_selections["Rocks"]) == objects[3:5]
+
+
+def test_missing_objects_are_counted(addon, scene, objects, exported, fake_bpy):
+    fake_bpy.data.objects.remove(objects[4])
+
+    _, added, missing = addon.import_named_selections(scene, exported, 'REPLACE')
+
+    assert (added, missing) == (4, 1)
+
+
+def test_element_records_skip_object_selection_of_the_same_name(addon, scene, objects, tmp_path):
+    path = tmp_path / "elements.jsonl"
+    path.write_text(
+        '{"format": "named-selections", "version": 1}\n'
+        '{"selection": "Trees", "element_type": "FACE"}\n'
+        f'{{"objects": ["{objects[6].name}"], "elements": [[4, "eJxjAAAAAQAB"]]}}\n')
+    trees = addon.new_named_selection(scene, "Trees")
+
+    assert addon.import_named_selections(scene, str(path), 'UPDATE') == (1, 1, 0)
+    assert members(addon, trees) == [objects[6]]
+
+
+def test_other_files_are_rejected(addon, scene, tmp_path):
+    path = tmp_path / "other.jsonl"
+    path.write_text('{"format": "something-else"}\n')
+    with pytest.raises(ValueError):
+        addon.import_named_selections(scene, str(path))
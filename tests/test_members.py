@@ -0,0 +1,89 @@
+import pytest
+
+
+@pytest.fixture
+def faces(addon, scene, objects):
+    """A face named selection whose members each carry a mask naming their object."""
+    named_selection = addon.new_named_selection(scene, "Faces")
+    named_selection.element_type = 'FACE'
+    addon.add_members(named_selection, objects)
+    for index, member in enumerate(named_selection.objects):
+        member.elements = f"mask-{member.object.name}"
+        member.element_count = index
+    return named_selection
+
+
+def test_object_members_live_in_storage_collection(addon, scene, objects):
+    named_selection = addon.new_named_selection(scene, "Objects")
+    assert addon.add_members(named_selection, objects[:3] + objects[:1]) == 3
+
+    assert addon.uses_compact_storage(named_selection)
+    assert list(named_selection.storage.objects) == objects[:3]
+    assert len(named_selection.objects) == 0
+    assert addon.get_member(named_selection, objects[0]) is None
+
+
+def test_swap_removal_keeps_masks_with_their_objects(addon, faces, objects):
+    counts = {member.object: member.element_count for member in faces.objects}
+
+    addon.remove_member_slots(faces, [6, 3, 1])
+
+    remaining = [member.object for member in faces.objects]
+    assert sorted(remaining, key=objects.index) == [objects[index] for index in (0, 2, 4, 5, 7)]
+    for member in faces.objects:
+        assert member.elements == f"mask-{member.object.name}"
+        assert member.element_count == counts[member.object]
+
+
+def test_swap_removal_keeps_membership_index_in_sync(addon, faces, objects):
+    addon.remove_member_slots(faces, [7, 0])
+
+    for slot, member in enumerate(faces.objects):
+        assert addon.get_member(faces, member.object) is member
+        assert addon.get_membership_index(faces).slots[member.object] == slot
+    assert not addon.contains_member(faces, objects[0])
+    assert not addon.contains_member(faces, objects[7])
+
+
+def test_remove_members_by_object(addon, faces, objects):
+    assert addon.remove_members(faces, [objects[1], objects[1], objects[5]]) == 2
+    assert addon.get_member_count(faces) == 6
+    assert addon.get_member(faces, objects[2]).elements == f"mask-{objects[2].name}"
+
+
+def test_shared_storage_collection_is_copied_before_changes(addon, scene, objects):
+    first = addon.new_named_selection(scene, "First")
+    addon.add_members(first, objects[:2])
+    second = addon.new_named_selection(scene, "Second")
+    second.storage = first.storage
+
+    addon.add_members(second, objects[2:3])
+    assert list(first.storage.objects) == objects[:2]
+    assert list(second.storage.objects) == objects[:3]
+
+    second.storage = first.storage
+    addon.clear_members(first)
+    assert list(second.storage.objects) == objects[:2]
+
+
+def test_element_mask_round_trip(addon):
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    for count in (0, 1, 7, 8, 9, 1000):
+        mask = rng.random(count) < 0.3
+        packed = addon.pack_element_mask(mask)
+        assert packed.isascii()
+        assert np.array_equal(addon.unpack_element_mask(packed, count), mask)
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ('REPLACE', [False, True, True, False]),
+    ('APPEND', [True, True, True, False]),
+    ('SUBTRACT', [True, False, False, False]),
+    ('INTERSECT', [False, True, False, False]),
+])
+def test_combine_element_masks(addon, mode, expected):
+    np = pytest.importorskip("numpy")
+    current = np.array([True, True, False, False])
+    operand = np.array([False, True, True, False])
+    assert addon.combine_element_masks(current, operand, mode).tolist() == expected
@@ -0,0 +1,26 @@
+from NamedSelection import UniqueNameAllocator
+
+
+def test_free_name_is_kept():
+    allocator = UniqueNameAllocator(["Trees"])
+    assert allocator.allocate("Rocks") == "Rocks"
+
+
+def test_taken_names_get_increasing_suffixes():
+    allocator = UniqueNameAllocator(["Trees", "Trees.02"])
+    assert [allocator.allocate("Trees") for _ in range(3)] == ["Trees.01", "Trees.03", "Trees.04"]
+    assert {"Trees.01", "Trees.03", "Trees.04"} <= allocator.names
+
+
+def test_suffixes_are_tracked_per_base_name():
+    allocator = UniqueNameAllocator(["A", "B"])
+    assert allocator.allocate("A") == "A.01"
+    assert allocator.allocate("B") == "B.01"
+    assert allocator.allocate("A") == "A.02"
+
+
+def test_generate_unique_name_uses_scene_names(addon, scene):
+    addon.new_named_selection(scene, "Unnamed")
+    addon.new_named_selection(scene, "Unnamed.01")
+    assert addon.generate_unique_name(scene) == "Unnamed.02"
+    assert addon.generate_unique_name(scene, "Trees") == "Trees"
@@ -0,0 +1,70 @@
+import array
+
+from NamedSelection import SNAPSHOT_OVERHEAD_BYTES, SelectionHistory, decode_selection_delta, encode_selection_delta
+
+UNLIMITED = 1 << 30
+
+
+def test_sparse_delta_is_stored_as_indices():
+    delta = 1 << 10000 | 1 << 3
+    encoded, size = encode_selection_delta(delta)
+    assert isinstance(encoded, array.array)
+    assert size == 8
+    assert decode_selection_delta(encoded) == delta
+
+
+def test_dense_delta_is_stored_as_bitset():
+    delta = 0b1011_0111
+    encoded, size = encode_selection_delta(delta)
+    assert encoded == delta
+    assert size == 1
+    assert decode_selection_delta(encoded) == delta
+
+
+def test_snapshots_are_restored_from_deltas():
+    history = SelectionHistory()
+    states = [0b0001, 0b0011, 0b1100, 1 << 5000 | 0b1100]
+    for state in states:
+        assert history.push(state, bin(state).count("1"), UNLIMITED, UNLIMITED)
+
+    assert len(history) == len(states)
+    for index, state in enumerate(reversed(states)):
+        assert history.get(index) == state
+    assert [count for count, _ in history.describe()] == [3, 2, 2, 1]
+
+
+def test_unchanged_selection_is_not_pushed():
+    history = SelectionHistory()
+    assert history.push(0b101, 2, UNLIMITED, UNLIMITED)
+    assert not history.push(0b101, 2, UNLIMITED, UNLIMITED)
+    assert len(history) == 1
+
+
+def test_oldest_snapshots_are_evicted_by_count():
+    history = SelectionHistory()
+    for state in range(1, 11):
+        history.push(state, 1, 4, UNLIMITED)
+
+    assert len(history) == 4
+    assert [history.get(index) for index in range(4)] == [10, 9, 8, 7]
+
+
+def test_oldest_snapshots_are_evicted_by_size():
+    history = SelectionHistory()
+    for shift in range(0, 4000, 1000):
+        history.push((1 << 4000) - 1 ^ 1 << shift, 3999, UNLIMITED, 600)
+
+    # The newest snapshot is always kept, the older ones only while they fit
+    assert history.size <= 600 or len(history) == 1
+    assert history.get(0) == (1 << 4000) - 1 ^ 1 << 3000
+    assert len(history) < 4
+
+
+def test_size_is_accounted_on_eviction():
+    history = SelectionHistory()
+    for state in range(1, 6):
+        history.push(state, 1, 2, UNLIMITED)
+    latest_bytes = (history.latest.bit_length() + 7) // 8
+    entry_bytes = sum(size for _, size, _, _ in history.entries)
+    overhead = SNAPSHOT_OVERHEAD_BYTES * len(history)
+    assert history.size == latest_bytes + entry_bytes + overhead
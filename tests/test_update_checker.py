@@ -0,0 +1,129 @@
+import http.server
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import bpy
+
+
+class ReleaseServer(http.server.ThreadingHTTPServer):
+    """Answers like the GitHub releases endpoint and counts the requests it gets."""
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), ReleaseHandler)
+        self.delay = delay
+        self.requests = []
+        self.tag = "v9.9.9"
+        self.etag = '"release-1"'
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/releases/latest"
+
+
+class ReleaseHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+        time.sleep(server.delay)
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f'{{"tag_name": "{server.tag}"}}'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ReleaseServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def checker(addon, scene, server, tmp_path):
+    checker = addon.UpdateChecker(server.url, os.path.join(tmp_path, "update_check.json"), ttl=60.0, timeout=5.0)
+    yield checker
+    checker.cancel()
+
+
+def wait_for(answers, count, timeout=5.0):
+    """Run the timers like Blender's event loop until count answers arrived."""
+    deadline = time.monotonic() + timeout
+    while len(answers) < count:
+        assert time.monotonic() < deadline, "the update check did not finish"
+        bpy.app.timers.run_all()
+        time.sleep(0.01)
+
+
+def test_first_check_reads_release_and_etag(checker, server):
+    answers = []
+    assert checker.check(lambda *answer: answers.append(answer))
+    wait_for(answers, 1)
+
+    assert answers == [("v9.9.9", None)]
+    assert server.requests == [None]
+    cache = checker.load_cache()
+    assert cache["latest_version"] == "v9.9.9"
+    assert cache["etag"] == server.etag
+
+
+def test_expired_cache_is_revalidated_with_etag(checker, server):
+    answers = []
+    checker.check(lambda *answer: answers.append(answer))
+    wait_for(answers, 1)
+
+    checker.save_cache(dict(checker.load_cache(), checked_at=time.time() - 120.0))
+    checker.check(lambda *answer: answers.append(answer))
+    wait_for(answers, 2)
+
+    # The second request was answered with 304, and the cached release was kept
+    assert server.requests == [None, server.etag]
+    assert answers[1] == ("v9.9.9", None)
+    assert time.time() - checker.load_cache()["checked_at"] < 60.0
+
+
+def test_fresh_cache_is_answered_without_request(checker, server):
+    answers = []
+    checker.check(lambda *answer: answers.append(answer))
+    wait_for(answers, 1)
+
+    assert not checker.check(lambda *answer: answers.append(answer))
+    assert answers[1] == ("v9.9.9", None)
+    assert len(server.requests) == 1
+
+
+def test_overlapping_checks_share_one_request(checker, server):
+    server.delay = 0.2
+    answers = []
+    assert checker.check(lambda *answer: answers.append(("first",) + answer))
+    assert checker.check(lambda *answer: answers.append(("second",) + answer), force=True)
+    wait_for(answers, 2)
+
+    assert sorted(answers) == [("first", "v9.9.9", None), ("second", "v9.9.9", None)]
+    assert len(server.requests) == 1
+
+
+def test_cancel_unregisters_polling_timer(checker, server):
+    server.delay = 0.2
+    checker.check(lambda *answer: None)
+    assert bpy.app.timers.is_registered(checker._deliver_timer)
+
+    checker.cancel()
+    assert not bpy.app.timers.is_registered(checker._deliver_timer)